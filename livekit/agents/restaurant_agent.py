@@ -3,8 +3,13 @@ Main restaurant voice agent implementation using LiveKit Agents framework.
 """
 
 import os
+import sys
+import asyncio
 from dotenv import load_dotenv
 
+# Load environment variables before importing modules that read them at import time
+load_dotenv(".env.local")
+
 from livekit import agents, rtc
 from livekit.agents import Agent, AgentSession, AgentServer, RunContext, room_io
 from livekit.plugins import openai, deepgram, cartesia, silero, noise_cancellation, turn_detector
@@ -23,12 +28,13 @@ from agents.tools import (
     send_payment_link,
     send_order_confirmation,
 )
+from agents.tools.payment_tools import get_stripe_client
+from twilio.sms_client import close_sms_clients, validate_twilio_env
+from stripe.payment_client import close_http_client as close_stripe_http_client
 from monitoring.logger import get_logger, setup_logging
+from monitoring.alerts import get_alert_manager
 from monitoring.metrics import get_metrics_collector, Metrics
 
-# Load environment variables
-load_dotenv(".env.local")
-
 # Setup logging
 setup_logging()
 logger = get_logger(__name__)
@@ -111,6 +117,17 @@ class RestaurantAgent(Agent):
         metrics.increment_counter(Metrics.AGENT_ERRORS, labels={"error_type": type(error).__name__})
 
 
+async def _warm_up_payment_client() -> None:
+    """Prime the Stripe connection pool so the first payment link is fast."""
+    try:
+        await get_stripe_client().warm_up()
+    except Exception as e:
+        logger.warning(f"Stripe warm-up failed: {e}")
+
+
+# CLI subcommands that run a worker connected to LiveKit
+WORKER_COMMANDS = ("start", "dev")
+
 # Create agent server
 server = AgentServer()
 
@@ -130,6 +147,21 @@ async def restaurant_order_agent(ctx: agents.JobContext):
         }
     )
     
+    # Warm up Stripe alongside session start; release its pool when the job ends
+    stripe_warm_up = asyncio.create_task(_warm_up_payment_client())
+    
+    async def close_payment_client() -> None:
+        await stripe_warm_up
+        await close_stripe_http_client()
+    
+    ctx.add_shutdown_callback(close_payment_client)
+    
+    # Send any alerts still queued for Sentry before the job exits
+    ctx.add_shutdown_callback(get_alert_manager().close)
+    
+    # Send any order texts still in the SMS outbox before the job exits
+    ctx.add_shutdown_callback(close_sms_clients)
+    
     # Track call start time
     metrics.start_timer(f"call_{ctx.job.id}")
     
@@ -223,4 +255,8 @@ if __name__ == "__main__":
         python agents/restaurant_agent.py download-files
     """
     logger.info("Starting restaurant voice agent")
+    
+    # Only the worker modes send SMS; console and download-files run without Twilio
+    if len(sys.argv) > 1 and sys.argv[1] in WORKER_COMMANDS:
+        validate_twilio_env()
     agents.cli.run_app(server)
@@ -17,10 +17,11 @@ RESTAURANT_MENU = get_restaurant_menu()
 
 def get_current_order(context: RunContext) -> Order:
     """Get or create the current order from session context."""
-    if not hasattr(context, "order") or context.order is None:
-        context.order = Order()
-        logger.info(f"Created new order: {context.order.order_id}")
-    return context.order
+    order = getattr(context, "order", None)
+    if order is None:
+        order = context.order = Order()
+        logger.info("Created new order: %s", order.order_id)
+    return order
 
 
 @function_tool()
@@ -42,34 +43,34 @@ async def add_item_to_order(
     Returns:
         Confirmation message with updated order total
     """
+    order = get_current_order(context)
+    
+    # Find the menu item
+    results = RESTAURANT_MENU.search_items(query=item_name)
+    
+    if not results:
+        return f"Sorry, I couldn't find '{item_name}' on our menu. Could you try another item?"
+    
+    menu_item = results[0]
+    
+    # Check if item is available
+    if not menu_item.available:
+        return f"Sorry, {menu_item.name} is currently unavailable. Would you like to try something else?"
+    
+    # Validate customizations if provided
+    if customizations and menu_item.customizable:
+        invalid_options = []
+        for key, value in customizations.items():
+            if key not in menu_item.customization_options:
+                invalid_options.append(key)
+            elif value not in menu_item.customization_options[key]:
+                invalid_options.append(f"{key}={value}")
+        
+        if invalid_options:
+            return f"Invalid customization options: {', '.join(invalid_options)}. Please check available options."
+    
+    # Add item to order
     try:
-        order = get_current_order(context)
-        
-        # Find the menu item
-        results = RESTAURANT_MENU.search_items(query=item_name)
-        
-        if not results:
-            return f"Sorry, I couldn't find '{item_name}' on our menu. Could you try another item?"
-        
-        menu_item = results[0]
-        
-        # Check if item is available
-        if not menu_item.available:
-            return f"Sorry, {menu_item.name} is currently unavailable. Would you like to try something else?"
-        
-        # Validate customizations if provided
-        if customizations and menu_item.customizable:
-            invalid_options = []
-            for key, value in customizations.items():
-                if key not in menu_item.customization_options:
-                    invalid_options.append(key)
-                elif value not in menu_item.customization_options[key]:
-                    invalid_options.append(f"{key}={value}")
-            
-            if invalid_options:
-                return f"Invalid customization options: {', '.join(invalid_options)}. Please check available options."
-        
-        # Add item to order
         order.add_item(
             menu_item_id=menu_item.id,
             name=menu_item.name,
@@ -78,32 +79,31 @@ async def add_item_to_order(
             customizations=customizations or {},
             special_instructions=special_instructions,
         )
-        
-        logger.info(
-            f"Added to order {order.order_id}: {quantity}x {menu_item.name}",
-            extra={"order_id": order.order_id, "item": menu_item.name, "quantity": quantity}
-        )
-        
-        # Build confirmation message
-        response = f"Added {quantity} {menu_item.name}"
-        if quantity > 1:
-            response += "s"
-        response += f" to your order"
-        
-        if customizations:
-            custom_str = ", ".join([f"{k}: {v}" for k, v in customizations.items()])
-            response += f" with {custom_str}"
-        
-        if special_instructions:
-            response += f" (Note: {special_instructions})"
-        
-        response += f". Your current subtotal is ${order.subtotal:.2f}."
-        
-        return response
-    
     except Exception as e:
         logger.error(f"Error adding item to order: {e}", exc_info=True)
         return f"Sorry, I encountered an error adding that item: {str(e)}"
+    
+    logger.info(
+        f"Added to order {order.order_id}: {quantity}x {menu_item.name}",
+        extra={"order_id": order.order_id, "item": menu_item.name, "quantity": quantity}
+    )
+    
+    # Build confirmation message
+    response = f"Added {quantity} {menu_item.name}"
+    if quantity > 1:
+        response += "s"
+    response += f" to your order"
+    
+    if customizations:
+        custom_str = ", ".join([f"{k}: {v}" for k, v in customizations.items()])
+        response += f" with {custom_str}"
+    
+    if special_instructions:
+        response += f" (Note: {special_instructions})"
+    
+    response += f". Your current subtotal is ${order.subtotal:.2f}."
+    
+    return response
 
 
 @function_tool()
@@ -2,28 +2,53 @@
 Payment and SMS notification function tools for the agent.
 """
 
+import re
 from typing import Optional
 from livekit.agents import function_tool, RunContext, ToolError
 
 from agents.models.order import OrderStatus
 from agents.tools.order_tools import get_current_order
-from twilio.sms_client import TwilioSMSClient
+from twilio.sms_client import TwilioSMSClient, get_default_sms_client
 from stripe.payment_client import StripePaymentClient
 from monitoring.logger import get_logger
+from monitoring.alerts import get_alert_manager
 
 logger = get_logger(__name__)
 
+# E.164 phone number: "+" followed by 8-15 digits, no leading zero
+E164_PHONE_PATTERN = re.compile(r"\+[1-9]\d{7,14}", re.ASCII)
+
+# Spoken confirmation returned once an order is completed
+ORDER_CONFIRMATION_RESPONSE = (
+    "Perfect! Your order #{order_id} for ${total:.2f} has been confirmed. "
+    "I've sent a secure payment link to {phone}. "
+    "Once payment is complete, your order will be prepared and ready for {order_type} "
+    "in approximately 20-30 minutes. Thank you!"
+)
+
 # Initialize clients (will be created on first use)
-_twilio_client: Optional[TwilioSMSClient] = None
 _stripe_client: Optional[StripePaymentClient] = None
 
 
+def validate_phone_number(phone: str) -> None:
+    """
+    Validate that a phone number is in E.164 format.
+    
+    Raises:
+        ToolError: If the phone number is not valid E.164
+    """
+    if phone[:1] != "+":
+        raise ToolError("Phone number must include country code (e.g., +1234567890)")
+    if not E164_PHONE_PATTERN.fullmatch(phone):
+        raise ToolError(
+            "Phone number must be a + followed by 8 to 15 digits with no spaces "
+            "or punctuation (e.g., +1234567890)"
+        )
+
+
 def get_twilio_client() -> TwilioSMSClient:
     """Get or create Twilio SMS client."""
-    global _twilio_client
-    if _twilio_client is None:
-        _twilio_client = TwilioSMSClient()
-    return _twilio_client
+    return get_default_sms_client()
 
 
 def get_stripe_client() -> StripePaymentClient:
@@ -51,33 +76,32 @@ async def complete_order(
     Returns:
         Confirmation message indicating the order was completed and SMS sent
     """
+    order = get_current_order(context)
+    
+    if not order.items:
+        raise ToolError("Cannot complete an empty order. Please add items first.")
+    
+    # Validate phone number format
+    validate_phone_number(customer_phone)
+    
+    # Update order with customer information
+    order.customer_phone = customer_phone
+    order.customer_name = customer_name
+    order.order_type = order_type
+    order.status = OrderStatus.CONFIRMED
+    
+    logger.info(
+        f"Completing order {order.order_id}",
+        extra={
+            "order_id": order.order_id,
+            "customer_phone": customer_phone,
+            "total": order.total,
+            "item_count": len(order.items),
+        }
+    )
+    
+    # Generate payment link
     try:
-        order = get_current_order(context)
-        
-        if not order.items:
-            raise ToolError("Cannot complete an empty order. Please add items first.")
-        
-        # Validate phone number format
-        if not customer_phone.startswith("+"):
-            raise ToolError("Phone number must include country code (e.g., +1234567890)")
-        
-        # Update order with customer information
-        order.customer_phone = customer_phone
-        order.customer_name = customer_name
-        order.order_type = order_type
-        order.status = OrderStatus.CONFIRMED
-        
-        logger.info(
-            f"Completing order {order.order_id}",
-            extra={
-                "order_id": order.order_id,
-                "customer_phone": customer_phone,
-                "total": order.total,
-                "item_count": len(order.items),
-            }
-        )
-        
-        # Generate payment link
         stripe_client = get_stripe_client()
         payment_link = await stripe_client.create_payment_link(
             amount=int(order.total * 100),  # Convert to cents
@@ -85,10 +109,15 @@ async def complete_order(
             customer_phone=customer_phone,
             customer_name=customer_name,
         )
-        
-        order.payment_link = payment_link
-        
-        # Send order confirmation and payment link via SMS
+    except Exception as e:
+        logger.error(f"Error creating payment link: {e}", exc_info=True)
+        get_alert_manager().alert_payment_failure(order.order_id, str(e))
+        raise ToolError(f"Sorry, I encountered an error creating your payment link: {str(e)}")
+    
+    order.payment_link = payment_link
+    
+    # Send order confirmation and payment link via SMS
+    try:
         twilio_client = get_twilio_client()
         await twilio_client.send_order_confirmation(
             to=customer_phone,
@@ -97,28 +126,26 @@ async def complete_order(
             payment_link=payment_link,
             order_type=order_type,
         )
-        
-        logger.info(
-            f"Order {order.order_id} completed successfully",
-            extra={
-                "order_id": order.order_id,
-                "payment_link_sent": True,
-                "sms_sent": True,
-            }
-        )
-        
-        response = f"Perfect! Your order #{order.order_id} for ${order.total:.2f} has been confirmed. "
-        response += f"I've sent a secure payment link to {customer_phone}. "
-        response += f"Once payment is complete, your order will be prepared and ready for {order_type} "
-        response += "in approximately 20-30 minutes. Thank you!"
-        
-        return response
-    
-    except ToolError:
-        raise
     except Exception as e:
-        logger.error(f"Error completing order: {e}", exc_info=True)
-        raise ToolError(f"Sorry, I encountered an error completing your order: {str(e)}")
+        logger.error(f"Error sending order confirmation: {e}", exc_info=True)
+        get_alert_manager().alert_sms_failure(customer_phone, str(e))
+        raise ToolError(f"Sorry, I encountered an error texting your payment link: {str(e)}")
+    
+    logger.info(
+        f"Order {order.order_id} completed successfully",
+        extra={
+            "order_id": order.order_id,
+            "payment_link_sent": True,
+            "sms_sent": True,
+        }
+    )
+    
+    return ORDER_CONFIRMATION_RESPONSE.format(
+        order_id=order.order_id,
+        total=order.total,
+        phone=customer_phone,
+        order_type=order_type,
+    )
 
 
 @function_tool()
@@ -134,27 +161,31 @@ async def send_payment_link(
     Returns:
         Confirmation message
     """
+    order = get_current_order(context)
+    
+    if not order.items:
+        raise ToolError("Cannot send payment link for an empty order.")
+    
+    validate_phone_number(customer_phone)
+    
+    # Generate payment link
     try:
-        order = get_current_order(context)
-        
-        if not order.items:
-            raise ToolError("Cannot send payment link for an empty order.")
-        
-        if not customer_phone.startswith("+"):
-            raise ToolError("Phone number must include country code (e.g., +1234567890)")
-        
-        # Generate payment link
         stripe_client = get_stripe_client()
         payment_link = await stripe_client.create_payment_link(
             amount=int(order.total * 100),
             order_id=order.order_id,
             customer_phone=customer_phone,
         )
-        
-        order.payment_link = payment_link
-        order.customer_phone = customer_phone
-        
-        # Send SMS with payment link
+    except Exception as e:
+        logger.error(f"Error creating payment link: {e}", exc_info=True)
+        get_alert_manager().alert_payment_failure(order.order_id, str(e))
+        raise ToolError(f"Sorry, I encountered an error creating the payment link: {str(e)}")
+    
+    order.payment_link = payment_link
+    order.customer_phone = customer_phone
+    
+    # Send SMS with payment link
+    try:
         twilio_client = get_twilio_client()
         await twilio_client.send_payment_link(
             to=customer_phone,
@@ -162,19 +193,17 @@ async def send_payment_link(
             payment_link=payment_link,
             amount=order.total,
         )
-        
-        logger.info(
-            f"Payment link sent for order {order.order_id}",
-            extra={"order_id": order.order_id, "customer_phone": customer_phone}
-        )
-        
-        return f"I've sent the payment link to {customer_phone}. Please check your messages."
-    
-    except ToolError:
-        raise
     except Exception as e:
         logger.error(f"Error sending payment link: {e}", exc_info=True)
+        get_alert_manager().alert_sms_failure(customer_phone, str(e))
         raise ToolError(f"Sorry, I encountered an error sending the payment link: {str(e)}")
+    
+    logger.info(
+        f"Payment link sent for order {order.order_id}",
+        extra={"order_id": order.order_id, "customer_phone": customer_phone}
+    )
+    
+    return f"I've sent the payment link to {customer_phone}. Please check your messages."
 
 
 @function_tool()
@@ -190,18 +219,17 @@ async def send_order_confirmation(
     Returns:
         Confirmation message
     """
+    order = get_current_order(context)
+    
+    if not order.items:
+        raise ToolError("Cannot send confirmation for an empty order.")
+    
+    validate_phone_number(customer_phone)
+    
+    order.customer_phone = customer_phone
+    
+    # Send SMS confirmation
     try:
-        order = get_current_order(context)
-        
-        if not order.items:
-            raise ToolError("Cannot send confirmation for an empty order.")
-        
-        if not customer_phone.startswith("+"):
-            raise ToolError("Phone number must include country code (e.g., +1234567890)")
-        
-        order.customer_phone = customer_phone
-        
-        # Send SMS confirmation
         twilio_client = get_twilio_client()
         await twilio_client.send_order_confirmation(
             to=customer_phone,
@@ -209,16 +237,14 @@ async def send_order_confirmation(
             total=order.total,
             order_type=order.order_type,
         )
-        
-        logger.info(
-            f"Order confirmation sent for {order.order_id}",
-            extra={"order_id": order.order_id, "customer_phone": customer_phone}
-        )
-        
-        return f"I've sent an order confirmation to {customer_phone}."
-    
-    except ToolError:
-        raise
     except Exception as e:
         logger.error(f"Error sending confirmation: {e}", exc_info=True)
+        get_alert_manager().alert_sms_failure(customer_phone, str(e))
         raise ToolError(f"Sorry, I encountered an error sending the confirmation: {str(e)}")
+    
+    logger.info(
+        f"Order confirmation sent for {order.order_id}",
+        extra={"order_id": order.order_id, "customer_phone": customer_phone}
+    )
+    
+    return f"I've sent an order confirmation to {customer_phone}."
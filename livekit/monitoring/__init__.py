@@ -3,11 +3,12 @@ Monitoring and observability module for the restaurant voice agent.
 """
 
 from monitoring.logger import get_logger, setup_logging
-from monitoring.metrics import MetricsCollector, get_metrics_collector
+from monitoring.metrics import BoundMetric, MetricsCollector, get_metrics_collector
 
 __all__ = [
     "get_logger",
     "setup_logging",
+    "BoundMetric",
     "MetricsCollector",
     "get_metrics_collector",
 ]
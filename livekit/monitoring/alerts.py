@@ -3,9 +3,11 @@ Alert configuration and notification system.
 """
 
 import os
-from typing import Optional, Dict, Any
+import asyncio
+import logging
+from typing import Optional, Dict, Any, List
 from enum import Enum
-from monitoring.logger import get_logger
+from monitoring.logger import get_logger, is_enabled_for
 
 logger = get_logger(__name__)
 
@@ -25,12 +27,28 @@ class AlertLevel(str, Enum):
     CRITICAL = "critical"
 
 
+# Sentry alert batching
+SENTRY_BATCH_SIZE = 50
+SENTRY_FLUSH_INTERVAL = 1.0
+SENTRY_QUEUE_SIZE = 10000
+
+# Standard library log level for each alert level
+_ALERT_LOG_LEVELS: Dict[AlertLevel, int] = {
+    AlertLevel.INFO: logging.INFO,
+    AlertLevel.WARNING: logging.WARNING,
+    AlertLevel.ERROR: logging.ERROR,
+    AlertLevel.CRITICAL: logging.CRITICAL,
+}
+
+
 class AlertManager:
     """Manages alerts and notifications."""
     
     def __init__(self):
         """Initialize alert manager."""
         self.sentry_enabled = False
+        self._alert_queue: Optional[asyncio.Queue] = None
+        self._flush_task: Optional[asyncio.Task] = None
         
         # Initialize Sentry if configured
         if SENTRY_AVAILABLE:
@@ -60,27 +78,124 @@ class AlertManager:
             message: Alert message
             context: Additional context data
         """
-        # Log the alert
-        log_method = getattr(logger, level.value, logger.info)
-        log_method(
-            f"ALERT: {title}",
-            extra={
-                "alert_level": level.value,
-                "message": message,
-                **(context or {}),
-            }
-        )
+        # Log the alert, skipping record construction when the level is filtered
+        log_level = _ALERT_LOG_LEVELS[level]
+        if is_enabled_for(log_level):
+            logger.log(
+                log_level,
+                f"ALERT: {title}",
+                extra={
+                    "alert_level": level.value,
+                    "message": message,
+                    **(context or {}),
+                }
+            )
         
-        # Send to Sentry for errors and critical alerts
+        # Send to Sentry for errors and critical alerts, regardless of log level
         if self.sentry_enabled and level in [AlertLevel.ERROR, AlertLevel.CRITICAL]:
+            self._report_to_sentry({
+                "level": level,
+                "title": title,
+                "message": message,
+                "context": context or {},
+            })
+    
+    def _report_to_sentry(self, alert: Dict[str, Any]) -> None:
+        """
+        Queue an alert for batched delivery to Sentry.
+        
+        Critical alerts, and alerts raised outside a running event loop,
+        are sent immediately.
+        
+        Args:
+            alert: Alert data
+        """
+        if alert["level"] == AlertLevel.CRITICAL:
+            self._capture_alerts([alert])
+            return
+        
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._capture_alerts([alert])
+            return
+        
+        if self._flush_task is None or self._flush_task.done():
+            self._alert_queue = asyncio.Queue(maxsize=SENTRY_QUEUE_SIZE)
+            self._flush_task = loop.create_task(self._flush_loop(self._alert_queue))
+        
+        try:
+            self._alert_queue.put_nowait(alert)
+        except asyncio.QueueFull:
+            logger.warning("Sentry alert queue full, dropping alert", extra={"title": alert["title"]})
+    
+    async def _flush_loop(self, queue: asyncio.Queue) -> None:
+        """Drain queued alerts and send them to Sentry in batches."""
+        while True:
+            batch = [await queue.get()]
+            
+            # Give the batch a chance to fill up unless it is already full
+            if queue.qsize() < SENTRY_BATCH_SIZE - 1:
+                await asyncio.sleep(SENTRY_FLUSH_INTERVAL)
+            
+            while len(batch) < SENTRY_BATCH_SIZE and not queue.empty():
+                batch.append(queue.get_nowait())
+            
+            try:
+                self._capture_alerts(batch)
+            except Exception as e:
+                logger.error(f"Failed to send alerts to Sentry: {e}")
+    
+    @staticmethod
+    def _capture_alerts(batch: List[Dict[str, Any]]) -> None:
+        """
+        Send a batch of alerts to Sentry, one event per distinct title.
+        
+        Alerts sharing a title are folded into a single event fingerprinted
+        by that title, so repeats group into one Sentry issue however they
+        were batched.
+        """
+        groups: Dict[str, List[Dict[str, Any]]] = {}
+        for alert in batch:
+            groups.setdefault(alert["title"], []).append(alert)
+        
+        for title, alerts in groups.items():
+            level = max((alert["level"] for alert in alerts), key=_ALERT_LOG_LEVELS.__getitem__)
+            summary = alerts[0]["message"] if len(alerts) == 1 else f"{len(alerts)} alerts"
+            
             with sentry_sdk.push_scope() as scope:
                 scope.set_level(level.value)
+                scope.fingerprint = ["alert", title]
                 scope.set_context("alert", {
                     "title": title,
-                    "message": message,
-                    **(context or {}),
+                    "count": len(alerts),
+                    "alerts": [
+                        {"message": alert["message"], **alert["context"]}
+                        for alert in alerts
+                    ],
                 })
-                sentry_sdk.capture_message(f"{title}: {message}")
+                sentry_sdk.capture_message(f"{title}: {summary}")
+    
+    async def close(self) -> None:
+        """Stop the Sentry flush task and send any queued alerts."""
+        if self._flush_task is None:
+            return
+        
+        self._flush_task.cancel()
+        try:
+            await self._flush_task
+        except asyncio.CancelledError:
+            pass
+        self._flush_task = None
+        
+        batch: List[Dict[str, Any]] = []
+        while self._alert_queue is not None and not self._alert_queue.empty():
+            batch.append(self._alert_queue.get_nowait())
+            if len(batch) == SENTRY_BATCH_SIZE:
+                self._capture_alerts(batch)
+                batch = []
+        if batch:
+            self._capture_alerts(batch)
     
     def alert_high_error_rate(self, error_count: int, time_window: int) -> None:
         """Alert on high error rate."""
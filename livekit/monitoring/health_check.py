@@ -3,21 +3,93 @@ Health check endpoint for monitoring agent status.
 """
 
 import os
+import time
+import asyncio
+import orjson
 import psutil
-from typing import Dict, Any
-from fastapi import APIRouter
-from datetime import datetime
+from typing import Dict, Any, Optional
+from fastapi import APIRouter, Response
+from fastapi.responses import ORJSONResponse
 
-from monitoring.metrics import get_metrics_collector
+from monitoring.metrics import get_metrics_collector, utc_timestamp
 from monitoring.logger import get_logger
 
 logger = get_logger(__name__)
 
 router = APIRouter(prefix="/health", tags=["health"])
 
+# Static service info; these only change on restart
+APP_VERSION = "1.0.0"
+ENVIRONMENT = os.getenv("ENVIRONMENT", "development")
 
-@router.get("")
-async def health_check() -> Dict[str, Any]:
+REQUIRED_ENV_VARS = (
+    "LIVEKIT_URL",
+    "LIVEKIT_API_KEY",
+    "OPENAI_API_KEY",
+    "TWILIO_ACCOUNT_SID",
+    "STRIPE_API_KEY",
+)
+MISSING_ENV_VARS = tuple(var for var in REQUIRED_ENV_VARS if not os.getenv(var))
+
+# Liveness body is re-serialized only when the timestamp changes
+_live_body_timestamp: str = ""
+_live_body: bytes = b""
+
+# System metrics are sampled at most once per TTL window
+SYSTEM_METRICS_TTL = 2.0
+
+_system_metrics_cache: Optional[Dict[str, Any]] = None
+_system_metrics_ts: float = 0.0
+_system_metrics_lock = asyncio.Lock()
+
+# Prime the CPU counter so non-blocking samples return a meaningful delta
+psutil.cpu_percent(interval=None)
+
+
+def _sample_system_metrics() -> Dict[str, Any]:
+    """Take a non-blocking snapshot of CPU, memory and disk usage."""
+    cpu_percent = psutil.cpu_percent(interval=None)
+    memory = psutil.virtual_memory()
+    disk = psutil.disk_usage('/')
+    
+    return {
+        "cpu_percent": cpu_percent,
+        "memory": {
+            "total_gb": round(memory.total / (1024**3), 2),
+            "used_gb": round(memory.used / (1024**3), 2),
+            "available_gb": round(memory.available / (1024**3), 2),
+            "percent": memory.percent,
+        },
+        "disk": {
+            "total_gb": round(disk.total / (1024**3), 2),
+            "used_gb": round(disk.used / (1024**3), 2),
+            "free_gb": round(disk.free / (1024**3), 2),
+            "percent": disk.percent,
+        },
+    }
+
+
+async def get_system_metrics() -> Dict[str, Any]:
+    """
+    Get system metrics, reusing the last sample while it is still fresh.
+    
+    Concurrent probes coalesce on a lock so only one of them samples psutil.
+    
+    Returns:
+        System metrics snapshot
+    """
+    global _system_metrics_cache, _system_metrics_ts
+    
+    async with _system_metrics_lock:
+        now = time.monotonic()
+        if _system_metrics_cache is None or now - _system_metrics_ts >= SYSTEM_METRICS_TTL:
+            _system_metrics_cache = _sample_system_metrics()
+            _system_metrics_ts = now
+        return _system_metrics_cache
+
+
+@router.get("", response_class=ORJSONResponse)
+async def health_check() -> ORJSONResponse:
     """
     Health check endpoint.
     
@@ -28,59 +100,46 @@ async def health_check() -> Dict[str, Any]:
         metrics_collector = get_metrics_collector()
         metrics = metrics_collector.get_metrics()
         
-        # Get system metrics
-        cpu_percent = psutil.cpu_percent(interval=1)
-        memory = psutil.virtual_memory()
-        disk = psutil.disk_usage('/')
+        # Get system metrics (cached, non-blocking)
+        system = await get_system_metrics()
+        cpu_percent = system["cpu_percent"]
+        memory_percent = system["memory"]["percent"]
+        disk_percent = system["disk"]["percent"]
         
         health_data = {
             "status": "healthy",
-            "timestamp": datetime.now().isoformat(),
-            "version": "1.0.0",
-            "environment": os.getenv("ENVIRONMENT", "development"),
-            "system": {
-                "cpu_percent": cpu_percent,
-                "memory": {
-                    "total_gb": round(memory.total / (1024**3), 2),
-                    "used_gb": round(memory.used / (1024**3), 2),
-                    "available_gb": round(memory.available / (1024**3), 2),
-                    "percent": memory.percent,
-                },
-                "disk": {
-                    "total_gb": round(disk.total / (1024**3), 2),
-                    "used_gb": round(disk.used / (1024**3), 2),
-                    "free_gb": round(disk.free / (1024**3), 2),
-                    "percent": disk.percent,
-                },
-            },
+            "timestamp": utc_timestamp(),
+            "version": APP_VERSION,
+            "environment": ENVIRONMENT,
+            "system": system,
             "metrics": metrics,
         }
         
         # Determine overall health
-        if cpu_percent > 90 or memory.percent > 90 or disk.percent > 90:
+        if cpu_percent > 90 or memory_percent > 90 or disk_percent > 90:
             health_data["status"] = "degraded"
             health_data["warnings"] = []
             
             if cpu_percent > 90:
                 health_data["warnings"].append("High CPU usage")
-            if memory.percent > 90:
+            if memory_percent > 90:
                 health_data["warnings"].append("High memory usage")
-            if disk.percent > 90:
+            if disk_percent > 90:
                 health_data["warnings"].append("Low disk space")
         
-        return health_data
+        return ORJSONResponse(health_data)
     
     except Exception as e:
         logger.error(f"Health check failed: {e}", exc_info=True)
-        return {
+        return ORJSONResponse({
             "status": "unhealthy",
             "error": str(e),
-            "timestamp": datetime.now().isoformat(),
-        }
+            "timestamp": utc_timestamp(),
+        })
 
 
-@router.get("/ready")
-async def readiness_check() -> Dict[str, Any]:
+@router.get("/ready", response_class=ORJSONResponse)
+async def readiness_check() -> ORJSONResponse:
     """
     Readiness check endpoint (for Kubernetes).
     
@@ -88,48 +147,44 @@ async def readiness_check() -> Dict[str, Any]:
         Readiness status
     """
     try:
-        # Check if required services are configured
-        required_env_vars = [
-            "LIVEKIT_URL",
-            "LIVEKIT_API_KEY",
-            "OPENAI_API_KEY",
-            "TWILIO_ACCOUNT_SID",
-            "STRIPE_API_KEY",
-        ]
-        
-        missing_vars = [var for var in required_env_vars if not os.getenv(var)]
+        # Required services are checked once at import
+        missing_vars = MISSING_ENV_VARS
         
         if missing_vars:
-            return {
+            return ORJSONResponse({
                 "ready": False,
                 "message": f"Missing required environment variables: {', '.join(missing_vars)}",
-                "timestamp": datetime.now().isoformat(),
-            }
+                "timestamp": utc_timestamp(),
+            })
         
-        return {
+        return ORJSONResponse({
             "ready": True,
             "message": "Service is ready to accept requests",
-            "timestamp": datetime.now().isoformat(),
-        }
+            "timestamp": utc_timestamp(),
+        })
     
     except Exception as e:
         logger.error(f"Readiness check failed: {e}", exc_info=True)
-        return {
+        return ORJSONResponse({
             "ready": False,
             "error": str(e),
-            "timestamp": datetime.now().isoformat(),
-        }
+            "timestamp": utc_timestamp(),
+        })
 
 
-@router.get("/live")
-async def liveness_check() -> Dict[str, str]:
+@router.get("/live", response_class=ORJSONResponse)
+async def liveness_check() -> Response:
     """
     Liveness check endpoint (for Kubernetes).
     
     Returns:
         Liveness status
     """
-    return {
-        "alive": "true",
-        "timestamp": datetime.now().isoformat(),
-    }
+    global _live_body_timestamp, _live_body
+    
+    timestamp = utc_timestamp()
+    if timestamp != _live_body_timestamp:
+        _live_body_timestamp = timestamp
+        _live_body = orjson.dumps({"alive": "true", "timestamp": timestamp})
+    
+    return Response(content=_live_body, media_type="application/json")
@@ -7,9 +7,44 @@ import sys
 import logging
 from logging.handlers import RotatingFileHandler
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Any
 import structlog
 
+# Use orjson for JSON log rendering if available
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def _orjson_dumps(value: Any, option: int = 0, **kwargs: Any) -> str:
+    """Serialize a log event with orjson, returning str for the print logger.
+    
+    Non-str dict keys are stringified, as the stdlib json renderer does.
+    """
+    return orjson.dumps(value, option=option | orjson.OPT_NON_STR_KEYS, **kwargs).decode()
+
+
+# Processors shared by every renderer
+_BASE_PROCESSORS = (
+    structlog.contextvars.merge_contextvars,
+    structlog.processors.add_log_level,
+    structlog.processors.StackInfoRenderer(),
+    structlog.dev.set_exc_info,
+    structlog.processors.TimeStamper(fmt="iso"),
+)
+
+PROCESSORS_JSON = _BASE_PROCESSORS + (
+    structlog.processors.JSONRenderer(serializer=_orjson_dumps)
+    if ORJSON_AVAILABLE
+    else structlog.processors.JSONRenderer(),
+)
+PROCESSORS_CONSOLE = _BASE_PROCESSORS + (structlog.dev.ConsoleRenderer(),)
+
+# Minimum level passed to the filtering logger by setup_logging
+_log_level = logging.NOTSET
+
 
 def setup_logging(
     log_level: Optional[str] = None,
@@ -24,7 +59,12 @@ def setup_logging(
         log_file: Path to log file (optional)
         enable_json: Whether to use JSON formatting
     """
+    global _log_level
     log_level = log_level or os.getenv("LOG_LEVEL", "INFO")
+    level = logging.getLevelName(log_level.upper())
+    if not isinstance(level, int):
+        raise ValueError(f"Invalid log level: {log_level}")
+    _log_level = level
     log_file = log_file or os.getenv("LOG_FILE_PATH", "logs/app.log")
     
     # Create logs directory if it doesn't exist
@@ -35,13 +75,13 @@ def setup_logging(
     # Configure standard library logging
     logging.basicConfig(
         format="%(message)s",
-        level=getattr(logging, log_level.upper()),
+        level=level,
         handlers=[],
     )
     
     # Console handler
     console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setLevel(getattr(logging, log_level.upper()))
+    console_handler.setLevel(level)
     
     # File handler with rotation
     if log_file:
@@ -53,27 +93,14 @@ def setup_logging(
             maxBytes=max_bytes,
             backupCount=backup_count,
         )
-        file_handler.setLevel(getattr(logging, log_level.upper()))
+        file_handler.setLevel(level)
     
     # Configure structlog
-    processors = [
-        structlog.contextvars.merge_contextvars,
-        structlog.processors.add_log_level,
-        structlog.processors.StackInfoRenderer(),
-        structlog.dev.set_exc_info,
-        structlog.processors.TimeStamper(fmt="iso"),
-    ]
-    
-    if enable_json:
-        processors.append(structlog.processors.JSONRenderer())
-    else:
-        processors.append(structlog.dev.ConsoleRenderer())
+    processors = list(PROCESSORS_JSON if enable_json else PROCESSORS_CONSOLE)
     
     structlog.configure(
         processors=processors,
-        wrapper_class=structlog.make_filtering_bound_logger(
-            getattr(logging, log_level.upper())
-        ),
+        wrapper_class=structlog.make_filtering_bound_logger(level),
         context_class=dict,
         logger_factory=structlog.PrintLoggerFactory(),
         cache_logger_on_first_use=True,
@@ -100,6 +127,22 @@ def get_logger(name: str) -> structlog.BoundLogger:
     return structlog.get_logger(name)
 
 
+def is_enabled_for(level: int) -> bool:
+    """
+    Check whether log calls at a level would be emitted.
+    
+    Use this to skip building expensive log arguments when the level is
+    filtered out.
+    
+    Args:
+        level: Standard library log level (e.g. logging.INFO)
+        
+    Returns:
+        True if the configured level lets the call through
+    """
+    return level >= _log_level
+
+
 # Initialize logging on module import
 if not structlog.is_configured():
     setup_logging()
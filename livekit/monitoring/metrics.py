@@ -2,22 +2,169 @@
 Metrics collection for monitoring agent performance.
 """
 
+import math
 import time
-from typing import Dict, Any, Optional
-from collections import defaultdict
+import threading
+from array import array
+from typing import Dict, Any, Optional, Tuple, List, Final
+from collections import defaultdict, OrderedDict
+from functools import lru_cache
 from dataclasses import dataclass, field
-from datetime import datetime
+from datetime import datetime, timezone
+import numpy as np
+import orjson
 from monitoring.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Log-linear histogram layout: each power of two is split into linear sub-buckets.
+# Covers roughly 1e-6 to 1.7e13 with ~3% relative error; bin 0 holds values <= ~1e-6.
+HISTOGRAM_SUB_BUCKETS = 16
+HISTOGRAM_MIN_EXPONENT = -20
+HISTOGRAM_MAX_EXPONENT = 44
+HISTOGRAM_BINS = (HISTOGRAM_MAX_EXPONENT - HISTOGRAM_MIN_EXPONENT) * HISTOGRAM_SUB_BUCKETS + 1
+HISTOGRAM_QUANTILES = (0.5, 0.95, 0.99)
+
+# Maximum number of running timers; the least recently started are dropped
+MAX_ACTIVE_TIMERS = 4096
+
+
+# Offset from the monotonic clock to wall-clock time, captured once at import
+_EPOCH_OFFSET_NS = time.time_ns() - time.monotonic_ns()
+
 
 @dataclass
 class MetricValue:
     """Container for a metric value with timestamp."""
     value: float
-    timestamp: datetime = field(default_factory=datetime.now)
+    timestamp_ns: int = field(default_factory=time.monotonic_ns)
     labels: Dict[str, str] = field(default_factory=dict)
+    
+    @property
+    def timestamp(self) -> datetime:
+        """Wall-clock time the value was recorded, derived from the monotonic timestamp."""
+        return datetime.fromtimestamp((self.timestamp_ns + _EPOCH_OFFSET_NS) / 1e9)
+
+
+# Last formatted UTC timestamp as (epoch second, ISO string), swapped as one tuple
+_utc_timestamp_cache: Tuple[int, str] = (-1, "")
+
+
+def utc_timestamp() -> str:
+    """Get the current UTC time as an ISO string, re-formatted at most once per second."""
+    global _utc_timestamp_cache
+    
+    second = time.time_ns() // 1_000_000_000
+    cached_second, cached_iso = _utc_timestamp_cache
+    if second != cached_second:
+        cached_iso = datetime.fromtimestamp(second, timezone.utc).isoformat(timespec="seconds")
+        _utc_timestamp_cache = (second, cached_iso)
+    return cached_iso
+
+
+@lru_cache(maxsize=1024)
+def _format_key(name: str, label_items: Tuple[Tuple[str, str], ...]) -> str:
+    """Format a metric key from a name and label items."""
+    return name + "{" + ",".join(["%s=%s" % item for item in label_items]) + "}"
+
+
+class HDRHistogram:
+    """
+    Fixed-size log-linear histogram.
+    
+    Values are counted into bins rather than stored, so recording is O(1) and
+    memory does not grow with sample count. Count, sum, min and max are exact;
+    quantiles are estimated from the bins.
+    """
+    
+    __slots__ = ("counts", "count", "sum", "min", "max")
+    
+    def __init__(self):
+        """Initialize an empty histogram."""
+        self.counts = np.zeros(HISTOGRAM_BINS, dtype=np.uint64)
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+    
+    @staticmethod
+    def _bin_index(value: float) -> int:
+        """Map a value to its bin index."""
+        if value <= 0.0:
+            return 0
+        if not math.isfinite(value):
+            # +inf goes to the top bin; NaN (which compares false) to the bottom
+            return HISTOGRAM_BINS - 1 if value > 0.0 else 0
+        mantissa, exponent = math.frexp(value)
+        if exponent <= HISTOGRAM_MIN_EXPONENT:
+            return 0
+        if exponent > HISTOGRAM_MAX_EXPONENT:
+            return HISTOGRAM_BINS - 1
+        # mantissa is in [0.5, 1), split linearly into sub-buckets
+        sub_bucket = int((mantissa - 0.5) * (2 * HISTOGRAM_SUB_BUCKETS))
+        return (exponent - HISTOGRAM_MIN_EXPONENT - 1) * HISTOGRAM_SUB_BUCKETS + sub_bucket + 1
+    
+    @staticmethod
+    def _bin_value(index: int) -> float:
+        """Get the midpoint value of a bin."""
+        if index == 0:
+            return 0.0
+        octave, sub_bucket = divmod(index - 1, HISTOGRAM_SUB_BUCKETS)
+        exponent = octave + HISTOGRAM_MIN_EXPONENT + 1
+        mantissa = 0.5 + (sub_bucket + 0.5) / (2 * HISTOGRAM_SUB_BUCKETS)
+        return math.ldexp(mantissa, exponent)
+    
+    def observe(self, value: float) -> None:
+        """Record a value."""
+        self.counts[self._bin_index(value)] += 1
+        self.count += 1
+        self.sum += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+    
+    def merge(self, other: "HDRHistogram") -> None:
+        """Add another histogram's samples into this one."""
+        self.counts += other.counts
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+    
+    def _quantile(self, cumulative: np.ndarray, q: float) -> float:
+        """Estimate a quantile from precomputed cumulative bin counts."""
+        rank = max(1, math.ceil(q * self.count))
+        index = int(np.searchsorted(cumulative, rank))
+        return min(max(self._bin_value(index), self.min), self.max)
+    
+    def quantile(self, q: float) -> float:
+        """
+        Estimate a quantile.
+        
+        Args:
+            q: Quantile in [0, 1]
+            
+        Returns:
+            Estimated value, clamped to the observed min/max
+        """
+        if not self.count:
+            return 0.0
+        return self._quantile(np.cumsum(self.counts), q)
+    
+    def summary(self) -> Dict[str, float]:
+        """Get count, sum, min, max, avg and quantile estimates."""
+        cumulative = np.cumsum(self.counts)
+        summary = {
+            "count": self.count,
+            "sum": self.sum,
+            "min": self.min,
+            "max": self.max,
+            "avg": self.sum / self.count,
+        }
+        for q in HISTOGRAM_QUANTILES:
+            summary[f"p{round(q * 100)}"] = self._quantile(cumulative, q)
+        return summary
 
 
 class MetricsCollector:
@@ -25,10 +172,20 @@ class MetricsCollector:
     
     def __init__(self):
         """Initialize metrics collector."""
-        self.counters: Dict[str, int] = defaultdict(int)
+        # Counters map each key to a slot; values are int64 arrays sharded per
+        # thread and summed per slot when read
+        self._counter_slots: Dict[str, int] = {}
+        self._counter_local = threading.local()
+        self._counter_shards: List[array] = []
+        self._counter_shards_lock = threading.Lock()
         self.gauges: Dict[str, float] = {}
-        self.histograms: Dict[str, list] = defaultdict(list)
-        self.timers: Dict[str, float] = {}
+        self.histograms: Dict[str, HDRHistogram] = defaultdict(HDRHistogram)
+        self.timers: "OrderedDict[str, int]" = OrderedDict()
+        
+        # Bumped on every mutation so get_metrics can reuse its last snapshot
+        self._version = 0
+        self._snapshot_version = -1
+        self._snapshot: Dict[str, Any] = {}
         
         logger.info("Metrics collector initialized")
     
@@ -41,8 +198,46 @@ class MetricsCollector:
             value: Amount to increment by
             labels: Optional metric labels
         """
-        key = self._make_key(name, labels)
-        self.counters[key] += value
+        self._increment(self._make_key(name, labels), value)
+    
+    def _increment(self, key: str, value: int) -> None:
+        """Increment a counter under a precomputed metric key."""
+        slot = self._counter_slots.get(key)
+        if slot is None:
+            slot = self._register_counter(key)
+        
+        shard = self._counter_shard()
+        if slot >= len(shard):
+            shard.frombytes(bytes(shard.itemsize * (slot + 1 - len(shard))))
+        shard[slot] += value
+        self._version += 1
+    
+    def _register_counter(self, key: str) -> int:
+        """Assign a slot to a new counter key."""
+        with self._counter_shards_lock:
+            return self._counter_slots.setdefault(key, len(self._counter_slots))
+    
+    def _counter_shard(self) -> array:
+        """Get the calling thread's counter values, registering them on first use."""
+        try:
+            return self._counter_local.values
+        except AttributeError:
+            shard = self._counter_local.values = array("q")
+            with self._counter_shards_lock:
+                self._counter_shards.append(shard)
+            return shard
+    
+    @property
+    def counters(self) -> Dict[str, int]:
+        """Counter values summed across all thread shards."""
+        with self._counter_shards_lock:
+            slots = list(self._counter_slots.items())
+            shards = list(self._counter_shards)
+        
+        return {
+            key: sum(shard[slot] for shard in shards if slot < len(shard))
+            for key, slot in slots
+        }
     
     def set_gauge(self, name: str, value: float, labels: Optional[Dict[str, str]] = None) -> None:
         """
@@ -55,6 +250,7 @@ class MetricsCollector:
         """
         key = self._make_key(name, labels)
         self.gauges[key] = value
+        self._version += 1
     
     def record_histogram(self, name: str, value: float, labels: Optional[Dict[str, str]] = None) -> None:
         """
@@ -65,12 +261,28 @@ class MetricsCollector:
             value: Value to record
             labels: Optional metric labels
         """
-        key = self._make_key(name, labels)
-        self.histograms[key].append(value)
+        self._observe(self._make_key(name, labels), value)
+    
+    def _observe(self, key: str, value: float) -> None:
+        """Record a histogram value under a precomputed metric key."""
+        self.histograms[key].observe(value)
+        self._version += 1
+    
+    def labels(self, name: str, labels: Optional[Dict[str, str]] = None) -> "BoundMetric":
+        """
+        Bind a metric to a fixed set of labels.
+        
+        The metric key is computed once here, so updates through the returned
+        BoundMetric skip key construction entirely.
         
-        # Keep only last 1000 values
-        if len(self.histograms[key]) > 1000:
-            self.histograms[key] = self.histograms[key][-1000:]
+        Args:
+            name: Metric name
+            labels: Optional metric labels
+            
+        Returns:
+            BoundMetric for the given name and labels
+        """
+        return BoundMetric(self, self._make_key(name, labels))
     
     def start_timer(self, name: str) -> None:
         """
@@ -79,7 +291,13 @@ class MetricsCollector:
         Args:
             name: Timer name
         """
-        self.timers[name] = time.time()
+        self.timers[name] = time.monotonic_ns()
+        self.timers.move_to_end(name)
+        
+        # Evict timers that were never stopped
+        if len(self.timers) > MAX_ACTIVE_TIMERS:
+            evicted, _ = self.timers.popitem(last=False)
+            logger.warning(f"Timer '{evicted}' evicted before it was stopped")
     
     def stop_timer(self, name: str, labels: Optional[Dict[str, str]] = None) -> float:
         """
@@ -92,13 +310,13 @@ class MetricsCollector:
         Returns:
             Duration in seconds
         """
-        if name not in self.timers:
+        started_ns = self.timers.pop(name, None)
+        if started_ns is None:
             logger.warning(f"Timer '{name}' was not started")
             return 0.0
         
-        duration = time.time() - self.timers[name]
+        duration = (time.monotonic_ns() - started_ns) * 1e-9
         self.record_histogram(f"{name}_duration", duration, labels)
-        del self.timers[name]
         
         return duration
     
@@ -106,44 +324,94 @@ class MetricsCollector:
         """
         Get all metrics as a dictionary.
         
+        The counters, gauges and histograms come from a snapshot that is only
+        rebuilt after a metric changes. Each call returns copies of it, so
+        callers may modify the result freely.
+        
         Returns:
             Dictionary of all metrics
         """
-        metrics = {
-            "counters": dict(self.counters),
-            "gauges": dict(self.gauges),
-            "histograms": {},
-            "timestamp": datetime.now().isoformat(),
-        }
+        # Read the version first: a change made while the snapshot is being
+        # built bumps it again, so the next call rebuilds
+        version = self._version
+        if self._snapshot_version != version:
+            self._snapshot = {
+                "counters": self.counters,
+                "gauges": dict(self.gauges),
+                "histograms": {
+                    name: histogram.summary()
+                    for name, histogram in self.histograms.items()
+                    if histogram.count
+                },
+            }
+            self._snapshot_version = version
         
-        # Calculate histogram statistics
-        for name, values in self.histograms.items():
-            if values:
-                metrics["histograms"][name] = {
-                    "count": len(values),
-                    "sum": sum(values),
-                    "min": min(values),
-                    "max": max(values),
-                    "avg": sum(values) / len(values),
-                }
+        snapshot = self._snapshot
+        return {
+            "counters": dict(snapshot["counters"]),
+            "gauges": dict(snapshot["gauges"]),
+            "histograms": {name: dict(summary) for name, summary in snapshot["histograms"].items()},
+            "timestamp": utc_timestamp(),
+        }
+    
+    def get_metrics_json(self) -> bytes:
+        """
+        Get all metrics serialized as JSON.
         
-        return metrics
+        Returns:
+            JSON-encoded metrics
+        """
+        return orjson.dumps(self.get_metrics(), option=orjson.OPT_NON_STR_KEYS)
     
     def reset(self) -> None:
         """Reset all metrics."""
-        self.counters.clear()
+        with self._counter_shards_lock:
+            self._counter_slots.clear()
+            for shard in self._counter_shards:
+                del shard[:]
         self.gauges.clear()
         self.histograms.clear()
         self.timers.clear()
+        self._version += 1
         logger.info("Metrics reset")
     
     @staticmethod
     def _make_key(name: str, labels: Optional[Dict[str, str]]) -> str:
-        """Create a metric key from name and labels."""
+        """Create a metric key from name and labels, keeping the labels' insertion order."""
         if not labels:
             return name
-        label_str = ",".join(f"{k}={v}" for k, v in sorted(labels.items()))
-        return f"{name}{{{label_str}}}"
+        return _format_key(name, tuple(labels.items()))
+
+
+class BoundMetric:
+    """A metric bound to a fixed label set, with its key precomputed."""
+    
+    __slots__ = ("_collector", "_key", "_gauges")
+    
+    def __init__(self, collector: MetricsCollector, key: str):
+        """
+        Initialize bound metric.
+        
+        Args:
+            collector: Collector that stores the metric
+            key: Precomputed metric key
+        """
+        self._collector = collector
+        self._key = key
+        self._gauges = collector.gauges
+    
+    def inc(self, value: int = 1) -> None:
+        """Increment the bound counter."""
+        self._collector._increment(self._key, value)
+    
+    def set(self, value: float) -> None:
+        """Set the bound gauge value."""
+        self._gauges[self._key] = value
+        self._collector._version += 1
+    
+    def observe(self, value: float) -> None:
+        """Record a value in the bound histogram."""
+        self._collector._observe(self._key, value)
 
 
 # Global metrics collector instance
@@ -168,33 +436,33 @@ class Metrics:
     """Metric name constants."""
     
     # Call metrics
-    CALLS_TOTAL = "calls_total"
-    CALLS_ACTIVE = "calls_active"
-    CALL_DURATION = "call_duration"
+    CALLS_TOTAL: Final[str] = "calls_total"
+    CALLS_ACTIVE: Final[str] = "calls_active"
+    CALL_DURATION: Final[str] = "call_duration"
     
     # Order metrics
-    ORDERS_TOTAL = "orders_total"
-    ORDERS_COMPLETED = "orders_completed"
-    ORDERS_CANCELLED = "orders_cancelled"
-    ORDER_VALUE = "order_value"
-    ORDER_ITEMS = "order_items"
+    ORDERS_TOTAL: Final[str] = "orders_total"
+    ORDERS_COMPLETED: Final[str] = "orders_completed"
+    ORDERS_CANCELLED: Final[str] = "orders_cancelled"
+    ORDER_VALUE: Final[str] = "order_value"
+    ORDER_ITEMS: Final[str] = "order_items"
     
     # Payment metrics
-    PAYMENTS_TOTAL = "payments_total"
-    PAYMENTS_SUCCEEDED = "payments_succeeded"
-    PAYMENTS_FAILED = "payments_failed"
-    PAYMENT_AMOUNT = "payment_amount"
+    PAYMENTS_TOTAL: Final[str] = "payments_total"
+    PAYMENTS_SUCCEEDED: Final[str] = "payments_succeeded"
+    PAYMENTS_FAILED: Final[str] = "payments_failed"
+    PAYMENT_AMOUNT: Final[str] = "payment_amount"
     
     # SMS metrics
-    SMS_SENT = "sms_sent"
-    SMS_DELIVERED = "sms_delivered"
-    SMS_FAILED = "sms_failed"
+    SMS_SENT: Final[str] = "sms_sent"
+    SMS_DELIVERED: Final[str] = "sms_delivered"
+    SMS_FAILED: Final[str] = "sms_failed"
     
     # Agent metrics
-    AGENT_RESPONSE_TIME = "agent_response_time"
-    AGENT_ERRORS = "agent_errors"
-    TOOL_CALLS = "tool_calls"
+    AGENT_RESPONSE_TIME: Final[str] = "agent_response_time"
+    AGENT_ERRORS: Final[str] = "agent_errors"
+    TOOL_CALLS: Final[str] = "tool_calls"
     
     # System metrics
-    MEMORY_USAGE = "memory_usage_bytes"
-    CPU_USAGE = "cpu_usage_percent"
+    MEMORY_USAGE: Final[str] = "memory_usage_bytes"
+    CPU_USAGE: Final[str] = "cpu_usage_percent"
@@ -6,8 +6,15 @@ Script to make a test call to the agent using LiveKit API.
 import asyncio
 import argparse
 import os
+from typing import Final, Optional
 from livekit import api
 
+# LiveKit configuration, read once at startup
+LIVEKIT_URL: Final[Optional[str]] = os.environ.get("LIVEKIT_URL")
+LIVEKIT_API_KEY: Final[Optional[str]] = os.environ.get("LIVEKIT_API_KEY")
+LIVEKIT_API_SECRET: Final[Optional[str]] = os.environ.get("LIVEKIT_API_SECRET")
+SIP_TRUNK_ID: Final[Optional[str]] = os.environ.get("SIP_TRUNK_ID")  # You'll need to configure this
+
 
 async def make_test_call(phone_number: str, agent_name: str = "restaurant-order-agent"):
     """
@@ -17,34 +24,30 @@ async def make_test_call(phone_number: str, agent_name: str = "restaurant-order-
         phone_number: Phone number to call (E.164 format: +1234567890)
         agent_name: Name of the agent to dispatch
     """
-    # Get LiveKit credentials from environment
-    livekit_url = os.getenv("LIVEKIT_URL")
-    api_key = os.getenv("LIVEKIT_API_KEY")
-    api_secret = os.getenv("LIVEKIT_API_SECRET")
-    
-    if not all([livekit_url, api_key, api_secret]):
+    if not all([LIVEKIT_URL, LIVEKIT_API_KEY, LIVEKIT_API_SECRET]):
         raise ValueError("Missing LiveKit credentials in environment variables")
     
     # Create LiveKit API client
-    lkapi = api.LiveKitAPI(livekit_url, api_key, api_secret)
+    lkapi = api.LiveKitAPI(LIVEKIT_URL, LIVEKIT_API_KEY, LIVEKIT_API_SECRET)
     
     # Create a room for this call
     room_name = f"test-call-{phone_number.replace('+', '')}"
     
+    # Create the room and dispatch the agent concurrently
     print(f"Creating room: {room_name}")
-    room = await lkapi.room.create_room(
-        api.CreateRoomRequest(name=room_name)
-    )
-    print(f"Room created: {room.name}")
-    
-    # Create agent dispatch
     print(f"Dispatching agent: {agent_name}")
-    dispatch = await lkapi.agent_dispatch.create_dispatch(
-        api.CreateAgentDispatchRequest(
-            room=room_name,
-            agent_name=agent_name,
-        )
+    room, dispatch = await asyncio.gather(
+        lkapi.room.create_room(
+            api.CreateRoomRequest(name=room_name)
+        ),
+        lkapi.agent_dispatch.create_dispatch(
+            api.CreateAgentDispatchRequest(
+                room=room_name,
+                agent_name=agent_name,
+            )
+        ),
     )
+    print(f"Room created: {room.name}")
     print(f"Agent dispatched: {dispatch.id}")
     
     # Create SIP participant (make the call)
@@ -52,7 +55,7 @@ async def make_test_call(phone_number: str, agent_name: str = "restaurant-order-
     sip_participant = await lkapi.sip.create_sip_participant(
         api.CreateSIPParticipantRequest(
             room_name=room_name,
-            sip_trunk_id=os.getenv("SIP_TRUNK_ID"),  # You'll need to configure this
+            sip_trunk_id=SIP_TRUNK_ID,
             sip_call_to=phone_number,
             participant_identity=f"caller-{phone_number.replace('+', '')}",
         )
@@ -63,7 +66,7 @@ async def make_test_call(phone_number: str, agent_name: str = "restaurant-order-
     print(f"   Phone: {phone_number}")
     print(f"   Participant: {sip_participant.participant_identity}")
     print(f"\nThe agent should answer and greet the caller.")
-    print(f"Monitor the call in LiveKit dashboard: {livekit_url}/projects/p_/sessions")
+    print(f"Monitor the call in LiveKit dashboard: {LIVEKIT_URL}/projects/p_/sessions")
 
 
 def main():
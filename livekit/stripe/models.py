@@ -4,6 +4,7 @@ Data models for Stripe payment integration.
 
 from typing import Optional, Dict, Any
 from datetime import datetime
+import msgspec
 from pydantic import BaseModel, Field
 from enum import Enum
 
@@ -29,39 +30,39 @@ class PaymentLinkResult(BaseModel):
     status: PaymentStatus = Field(PaymentStatus.PENDING, description="Payment status")
 
 
-class PaymentIntentDetails(BaseModel):
+class PaymentIntentDetails(msgspec.Struct, kw_only=True):
     """Details of a Stripe Payment Intent."""
     
-    id: str = Field(..., description="Payment Intent ID")
-    amount: int = Field(..., description="Amount in cents")
-    currency: str = Field("usd", description="Currency code")
-    status: PaymentStatus = Field(..., description="Payment status")
-    created: int = Field(..., description="Unix timestamp of creation")
-    metadata: Dict[str, Any] = Field(default_factory=dict, description="Custom metadata")
+    id: str  # Payment Intent ID
+    amount: int  # Amount in cents
+    currency: str = "usd"  # Currency code
+    status: PaymentStatus  # Payment status
+    created: int  # Unix timestamp of creation
+    metadata: Dict[str, Any] = {}  # Custom metadata
     
-    customer_email: Optional[str] = Field(None, description="Customer email")
-    customer_phone: Optional[str] = Field(None, description="Customer phone")
+    customer_email: Optional[str] = None  # Customer email
+    customer_phone: Optional[str] = None  # Customer phone
     
-    receipt_url: Optional[str] = Field(None, description="Receipt URL")
-    invoice_url: Optional[str] = Field(None, description="Invoice URL")
+    receipt_url: Optional[str] = None  # Receipt URL
+    invoice_url: Optional[str] = None  # Invoice URL
 
 
-class RefundDetails(BaseModel):
+class RefundDetails(msgspec.Struct, kw_only=True):
     """Details of a payment refund."""
     
-    id: str = Field(..., description="Refund ID")
-    payment_intent_id: str = Field(..., description="Original payment intent ID")
-    amount: int = Field(..., description="Refund amount in cents")
-    status: str = Field(..., description="Refund status")
-    reason: Optional[str] = Field(None, description="Refund reason")
-    created: int = Field(..., description="Unix timestamp of creation")
+    id: str  # Refund ID
+    payment_intent_id: str  # Original payment intent ID
+    amount: int  # Refund amount in cents
+    status: str  # Refund status
+    reason: Optional[str] = None  # Refund reason
+    created: int  # Unix timestamp of creation
 
 
-class WebhookEvent(BaseModel):
+class WebhookEvent(msgspec.Struct, kw_only=True):
     """Stripe webhook event data."""
     
-    id: str = Field(..., description="Event ID")
-    type: str = Field(..., description="Event type")
-    created: int = Field(..., description="Unix timestamp")
-    data: Dict[str, Any] = Field(..., description="Event data")
-    livemode: bool = Field(..., description="Whether this is a live event")
+    id: str  # Event ID
+    type: str  # Event type
+    created: int  # Unix timestamp
+    data: Dict[str, Any]  # Event data
+    livemode: bool  # Whether this is a live event
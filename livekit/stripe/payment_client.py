@@ -3,15 +3,70 @@ Stripe payment client for generating payment links and handling payments.
 """
 
 import os
-from typing import Optional, Dict, Any
+import json
+import asyncio
+import hashlib
+from collections import OrderedDict
+from typing import Optional, Dict, Any, Final
 import stripe
-from stripe.error import StripeError
+from stripe import StripeError, InvalidRequestError
 
 from stripe.models import PaymentLinkResult
 from monitoring.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Stripe configuration, read once at import
+STRIPE_API_KEY: Final[Optional[str]] = os.environ.get("STRIPE_API_KEY")
+STRIPE_SUCCESS_URL: Final[str] = os.environ.get("STRIPE_SUCCESS_URL", "https://example.com/success")
+STRIPE_CANCEL_URL: Final[str] = os.environ.get("STRIPE_CANCEL_URL", "https://example.com/cancel")
+
+# Shared Stripe product that every order price is attached to
+DEFAULT_PRODUCT_ID = "restaurant_order"
+DEFAULT_PRODUCT_NAME = "Restaurant Order"
+STRIPE_PRODUCT_ID: Final[str] = os.environ.get("STRIPE_PRODUCT_ID", DEFAULT_PRODUCT_ID)
+
+# Request timeout for Stripe API calls, in seconds
+STRIPE_TIMEOUT = 10.0
+
+# Most recently used order amounts whose price IDs are kept per client
+STRIPE_PRICE_CACHE_SIZE = 1024
+
+
+# Process-wide pooled HTTP client shared by every StripePaymentClient
+_http_client: Optional[stripe.HTTPXClient] = None
+
+
+def _install_http_client() -> None:
+    """Route Stripe calls through the shared pooled httpx client, creating it once."""
+    global _http_client
+    if _http_client is None:
+        _http_client = stripe.HTTPXClient(timeout=STRIPE_TIMEOUT)
+        stripe.default_http_client = _http_client
+
+
+async def close_http_client() -> None:
+    """
+    Close the shared Stripe connection pool.
+    
+    Call once at shutdown. Later Stripe calls fall back to the SDK's default
+    client until a new StripePaymentClient is created.
+    """
+    global _http_client
+    if _http_client is None:
+        return
+    
+    client, _http_client = _http_client, None
+    if stripe.default_http_client is client:
+        stripe.default_http_client = None
+    await client.close_async()
+
+
+def _idempotency_key(prefix: str, params: Dict[str, Any]) -> str:
+    """Build an idempotency key that is stable for identical request params."""
+    digest = hashlib.sha256(json.dumps(params, sort_keys=True).encode()).hexdigest()
+    return f"{prefix}_{digest[:32]}"
+
 
 class StripePaymentClient:
     """Client for creating payment links and managing payments via Stripe."""
@@ -21,6 +76,7 @@ class StripePaymentClient:
         api_key: Optional[str] = None,
         success_url: Optional[str] = None,
         cancel_url: Optional[str] = None,
+        product_id: Optional[str] = None,
     ):
         """
         Initialize Stripe payment client.
@@ -29,10 +85,16 @@ class StripePaymentClient:
             api_key: Stripe API key (defaults to STRIPE_API_KEY env var)
             success_url: URL to redirect after successful payment
             cancel_url: URL to redirect after cancelled payment
+            product_id: Stripe product ID used for order prices (defaults to STRIPE_PRODUCT_ID env var)
         """
-        self.api_key = api_key or os.getenv("STRIPE_API_KEY")
-        self.success_url = success_url or os.getenv("STRIPE_SUCCESS_URL", "https://example.com/success")
-        self.cancel_url = cancel_url or os.getenv("STRIPE_CANCEL_URL", "https://example.com/cancel")
+        self.api_key = api_key or STRIPE_API_KEY
+        self.success_url = success_url or STRIPE_SUCCESS_URL
+        self.cancel_url = cancel_url or STRIPE_CANCEL_URL
+        self.product_id = product_id or STRIPE_PRODUCT_ID
+        self._product_ready = False
+        self._product_lock = asyncio.Lock()
+        # Price lookups on the shared product, keyed by unit amount in cents
+        self._prices: "OrderedDict[int, asyncio.Task]" = OrderedDict()
         
         if not self.api_key:
             raise ValueError(
@@ -40,8 +102,88 @@ class StripePaymentClient:
             )
         
         stripe.api_key = self.api_key
+        
+        _install_http_client()
+        
         logger.info("Stripe payment client initialized")
     
+    async def warm_up(self) -> None:
+        """
+        Open a pooled connection to Stripe ahead of the first order.
+        
+        This resolves the shared order product, which also primes DNS and TLS
+        for later payment link requests.
+        """
+        await self._get_product_id()
+    
+    async def _get_product_id(self) -> str:
+        """
+        Get the shared order product, creating it in Stripe on first use.
+        
+        Concurrent first calls share one lookup, and a create that loses a
+        race with another process falls back to the product it created.
+        
+        Returns:
+            Stripe product ID
+        """
+        if self._product_ready:
+            return self.product_id
+        
+        async with self._product_lock:
+            if not self._product_ready:
+                try:
+                    await stripe.Product.retrieve_async(self.product_id)
+                except InvalidRequestError:
+                    try:
+                        await stripe.Product.create_async(
+                            id=self.product_id, name=DEFAULT_PRODUCT_NAME
+                        )
+                        logger.info(f"Created Stripe product {self.product_id}")
+                    except InvalidRequestError as e:
+                        if e.code != "resource_already_exists":
+                            raise
+                self._product_ready = True
+        return self.product_id
+    
+    async def _get_price_id(self, amount: int) -> str:
+        """
+        Get a price on the shared product for an amount, creating it on first use.
+        
+        Concurrent calls for the same amount share one create request, since
+        a second request with the same idempotency key while the first is in
+        flight is rejected by Stripe. Failed lookups are retried on the next call.
+        
+        Args:
+            amount: Unit amount in cents
+            
+        Returns:
+            Stripe price ID
+        """
+        task = self._prices.get(amount)
+        if task is None or (task.done() and (task.cancelled() or task.exception() is not None)):
+            task = asyncio.ensure_future(self._create_price(amount))
+            self._prices[amount] = task
+            if len(self._prices) > STRIPE_PRICE_CACHE_SIZE:
+                self._prices.popitem(last=False)
+        else:
+            self._prices.move_to_end(amount)
+        
+        # Shielded so one cancelled caller doesn't fail the others sharing the task
+        return await asyncio.shield(task)
+    
+    async def _create_price(self, amount: int) -> str:
+        """Create a price on the shared product and return its ID."""
+        price_params = {
+            "currency": "usd",
+            "unit_amount": amount,
+            "product": await self._get_product_id(),
+        }
+        price = await stripe.Price.create_async(
+            **price_params,
+            idempotency_key=_idempotency_key("price", price_params),
+        )
+        return price.id
+    
     async def create_payment_link(
         self,
         amount: int,
@@ -67,15 +209,7 @@ class StripePaymentClient:
             StripeError: If payment link creation fails
         """
         try:
-            # Create a price for this order
-            price = stripe.Price.create(
-                unit_amount=amount,
-                currency="usd",
-                product_data={
-                    "name": f"Restaurant Order #{order_id}",
-                    "description": description or f"Order payment for {order_id}",
-                },
-            )
+            price_id = await self._get_price_id(amount)
             
             # Build metadata
             metadata = {
@@ -87,17 +221,23 @@ class StripePaymentClient:
                 metadata["customer_phone"] = customer_phone
             if customer_name:
                 metadata["customer_name"] = customer_name
+            if description:
+                metadata["description"] = description
             
-            # Create payment link
-            payment_link = stripe.PaymentLink.create(
-                line_items=[{"price": price.id, "quantity": 1}],
-                after_completion={
+            # Payment links only take a price ID; prices are reused per amount
+            link_params = {
+                "line_items": [{"price": price_id, "quantity": 1}],
+                "after_completion": {
                     "type": "redirect",
                     "redirect": {"url": self.success_url},
                 },
-                metadata=metadata,
-                phone_number_collection={"enabled": True},
-                allow_promotion_codes=True,
+                "metadata": metadata,
+                "phone_number_collection": {"enabled": True},
+                "allow_promotion_codes": True,
+            }
+            payment_link = await stripe.PaymentLink.create_async(
+                **link_params,
+                idempotency_key=_idempotency_key("plink", link_params),
             )
             
             logger.info(
@@ -143,20 +283,17 @@ class StripePaymentClient:
             Checkout session URL
         """
         try:
-            # Create price
-            price = stripe.Price.create(
-                unit_amount=amount,
-                currency="usd",
-                product_data={
-                    "name": f"Restaurant Order #{order_id}",
-                },
-            )
+            product_id = await self._get_product_id()
             
             # Build session params
             session_params = {
                 "payment_method_types": ["card"],
                 "line_items": [{
-                    "price": price.id,
+                    "price_data": {
+                        "currency": "usd",
+                        "unit_amount": amount,
+                        "product": product_id,
+                    },
                     "quantity": 1,
                 }],
                 "mode": "payment",
@@ -174,7 +311,10 @@ class StripePaymentClient:
                 session_params["phone_number_collection"] = {"enabled": True}
             
             # Create checkout session
-            session = stripe.checkout.Session.create(**session_params)
+            session = await stripe.checkout.Session.create_async(
+                **session_params,
+                idempotency_key=_idempotency_key("checkout", session_params),
+            )
             
             logger.info(
                 f"Checkout session created",
@@ -193,7 +333,7 @@ class StripePaymentClient:
             )
             raise
     
-    def get_payment_status(self, payment_intent_id: str) -> Dict[str, Any]:
+    async def get_payment_status(self, payment_intent_id: str) -> Dict[str, Any]:
         """
         Get the status of a payment intent.
         
@@ -204,7 +344,7 @@ class StripePaymentClient:
             Dictionary with payment status details
         """
         try:
-            payment_intent = stripe.PaymentIntent.retrieve(payment_intent_id)
+            payment_intent = await stripe.PaymentIntent.retrieve_async(payment_intent_id)
             
             return {
                 "id": payment_intent.id,
@@ -219,7 +359,7 @@ class StripePaymentClient:
             logger.error(f"Failed to retrieve payment intent: {e}", exc_info=True)
             raise
     
-    def refund_payment(
+    async def refund_payment(
         self,
         payment_intent_id: str,
         amount: Optional[int] = None,
@@ -247,7 +387,7 @@ class StripePaymentClient:
             if reason:
                 refund_params["reason"] = reason
             
-            refund = stripe.Refund.create(**refund_params)
+            refund = await stripe.Refund.create_async(**refund_params)
             
             logger.info(
                 f"Refund created",
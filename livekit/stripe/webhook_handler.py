@@ -3,12 +3,19 @@ Webhook handler for Stripe payment events.
 """
 
 import os
-from typing import Dict, Any
+import hmac
+import time
+import asyncio
+import hashlib
+import sys
+import logging
+from typing import Dict, Any, Optional, Tuple, Callable, Awaitable
+import msgspec
 from fastapi import APIRouter, Request, HTTPException, Header
-import stripe
-from stripe.error import SignatureVerificationError
+from stripe import SignatureVerificationError
 
-from monitoring.logger import get_logger
+from stripe.models import WebhookEvent
+from monitoring.logger import get_logger, is_enabled_for
 
 logger = get_logger(__name__)
 
@@ -17,6 +24,141 @@ router = APIRouter(prefix="/webhooks/stripe", tags=["stripe"])
 # Get webhook secret from environment
 WEBHOOK_SECRET = os.getenv("STRIPE_WEBHOOK_SECRET")
 
+# Events are acknowledged immediately and processed by a background worker
+WEBHOOK_QUEUE_SIZE = 10000
+
+_webhook_queue: Optional["asyncio.Queue[Tuple[str, Dict[str, Any]]]"] = None
+_webhook_worker_task: Optional[asyncio.Task] = None
+
+# Maximum age of a signed webhook, matching Stripe's default tolerance
+SIGNATURE_TOLERANCE = 300
+
+# HMAC keyed once with the webhook secret; copied for each signature check
+_signature_hmac: Optional[hmac.HMAC] = (
+    hmac.new(WEBHOOK_SECRET.encode(), digestmod=hashlib.sha256) if WEBHOOK_SECRET else None
+)
+
+
+def verify_signature(payload: bytes, signature_header: str) -> None:
+    """
+    Verify a Stripe-Signature header against the raw request body.
+    
+    Args:
+        payload: Raw request body
+        signature_header: Value of the Stripe-Signature header
+        
+    Raises:
+        SignatureVerificationError: If the signature is missing, invalid or too old
+    """
+    timestamp = None
+    signatures = []
+    for item in signature_header.split(","):
+        key, _, value = item.partition("=")
+        if key == "t":
+            timestamp = value
+        elif key == "v1":
+            signatures.append(value)
+    
+    if not timestamp or not timestamp.isdigit() or not signatures:
+        raise SignatureVerificationError(
+            "Unable to extract timestamp and signatures from header", signature_header
+        )
+    
+    mac = _signature_hmac.copy()
+    mac.update(timestamp.encode() + b"." + payload)
+    expected = mac.hexdigest()
+    
+    if not any(hmac.compare_digest(expected, signature) for signature in signatures):
+        raise SignatureVerificationError(
+            "No signatures found matching the expected signature for payload", signature_header
+        )
+    
+    if int(timestamp) < time.time() - SIGNATURE_TOLERANCE:
+        raise SignatureVerificationError(
+            "Timestamp outside the tolerance zone", signature_header
+        )
+
+
+async def enqueue_event(event_type: str, event_data: Dict[str, Any]) -> None:
+    """
+    Queue a webhook event for background processing.
+    
+    Starts the worker on first use. If the queue is full the event is
+    processed inline instead, so it is never dropped and a backlog slows
+    down acknowledgements rather than piling up unbounded work.
+    
+    Args:
+        event_type: Stripe event type
+        event_data: Event data object
+    """
+    global _webhook_queue, _webhook_worker_task
+    
+    if _webhook_worker_task is None or _webhook_worker_task.done():
+        _webhook_queue = asyncio.Queue(maxsize=WEBHOOK_QUEUE_SIZE)
+        _webhook_worker_task = asyncio.create_task(_webhook_worker(_webhook_queue))
+    
+    try:
+        _webhook_queue.put_nowait((event_type, event_data))
+    except asyncio.QueueFull:
+        logger.warning("Stripe webhook queue full, processing %s inline", event_type)
+        await _process_event(event_type, event_data)
+
+
+async def shutdown_webhook_worker() -> None:
+    """Process every acknowledged event still queued, then stop the worker."""
+    global _webhook_worker_task
+    
+    if _webhook_worker_task is None:
+        return
+    
+    if not _webhook_worker_task.done():
+        await _webhook_queue.join()
+    
+    _webhook_worker_task.cancel()
+    try:
+        await _webhook_worker_task
+    except asyncio.CancelledError:
+        pass
+    _webhook_worker_task = None
+
+
+# Included into the app's shutdown handlers by app.include_router(router)
+router.add_event_handler("shutdown", shutdown_webhook_worker)
+
+
+async def _webhook_worker(queue: "asyncio.Queue[Tuple[str, Dict[str, Any]]]") -> None:
+    """Process queued webhook events one at a time."""
+    while True:
+        event_type, event_data = await queue.get()
+        try:
+            await _process_event(event_type, event_data)
+        finally:
+            queue.task_done()
+
+
+async def _process_event(event_type: str, event_data: Dict[str, Any]) -> None:
+    """Run the handler for a webhook event, logging any failure."""
+    try:
+        await dispatch_event(event_type, event_data)
+    except Exception as e:
+        logger.error(f"Error processing Stripe event {event_type}: {e}", exc_info=True)
+
+
+async def dispatch_event(event_type: str, event_data: Dict[str, Any]) -> None:
+    """
+    Handle a Stripe webhook event by type.
+    
+    Args:
+        event_type: Stripe event type
+        event_data: Event data object
+    """
+    handler = EVENT_HANDLERS.get(event_type)
+    if handler is None:
+        logger.info("Unhandled event type: %s", event_type)
+        return
+    
+    await handler(event_data)
+
 
 @router.post("/payment")
 async def handle_payment_webhook(
@@ -39,50 +181,30 @@ async def handle_payment_webhook(
         # Verify webhook signature if secret is configured
         if WEBHOOK_SECRET and stripe_signature:
             try:
-                event = stripe.Webhook.construct_event(
-                    payload, stripe_signature, WEBHOOK_SECRET
-                )
+                verify_signature(payload, stripe_signature)
             except SignatureVerificationError as e:
                 logger.error(f"Invalid webhook signature: {e}")
                 raise HTTPException(status_code=400, detail="Invalid signature")
-        else:
-            # Parse event without signature verification (not recommended for production)
-            event = stripe.Event.construct_from(
-                stripe.util.convert_to_dict(payload), stripe.api_key
-            )
+        # Otherwise the event is parsed without verification (not recommended for production)
         
-        event_type = event.type
-        event_data = event.data.object
+        try:
+            event = msgspec.json.decode(payload, type=WebhookEvent)
+        except msgspec.DecodeError as e:
+            logger.error(f"Invalid webhook payload: {e}")
+            raise HTTPException(status_code=400, detail="Invalid payload")
         
-        logger.info(
-            f"Stripe webhook received",
-            extra={
-                "event_type": event_type,
-                "event_id": event.id,
-            }
-        )
-        
-        # Handle different event types
-        if event_type == "payment_intent.succeeded":
-            await handle_payment_succeeded(event_data)
-        
-        elif event_type == "payment_intent.payment_failed":
-            await handle_payment_failed(event_data)
-        
-        elif event_type == "charge.refunded":
-            await handle_charge_refunded(event_data)
-        
-        elif event_type == "checkout.session.completed":
-            await handle_checkout_completed(event_data)
+        event_type = event.type
+        event_data = event.data.get("object", {})
         
-        elif event_type == "payment_link.created":
-            logger.info(f"Payment link created: {event_data.get('id')}")
+        if is_enabled_for(logging.INFO):
+            logger.info("Stripe webhook received type=%s id=%s", event_type, event.id)
         
-        else:
-            logger.info(f"Unhandled event type: {event_type}")
+        await enqueue_event(event_type, event_data)
         
-        return {"status": "success"}
+        return {"status": "received"}
     
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error processing Stripe webhook: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail="Internal server error")
@@ -94,21 +216,18 @@ async def handle_payment_succeeded(payment_intent: Dict[str, Any]) -> None:
     amount = payment_intent.get("amount")
     payment_id = payment_intent.get("id")
     
-    logger.info(
-        f"Payment succeeded",
-        extra={
-            "order_id": order_id,
-            "payment_id": payment_id,
-            "amount": amount,
-        }
-    )
+    if is_enabled_for(logging.INFO):
+        logger.info(
+            "Payment succeeded order=%s payment=%s amount=%s", order_id, payment_id, amount
+        )
     
     # TODO: Update order status in database
     # TODO: Send confirmation SMS to customer
     # TODO: Notify restaurant staff
     
     # For now, just log
-    logger.info(f"Order {order_id} paid: ${amount/100:.2f}")
+    if is_enabled_for(logging.INFO):
+        logger.info("Order %s paid: $%.2f", order_id, (amount or 0) / 100)
 
 
 async def handle_payment_failed(payment_intent: Dict[str, Any]) -> None:
@@ -138,14 +257,11 @@ async def handle_charge_refunded(charge: Dict[str, Any]) -> None:
     metadata = charge.get("metadata", {})
     order_id = metadata.get("order_id")
     
-    logger.info(
-        f"Charge refunded",
-        extra={
-            "charge_id": charge_id,
-            "order_id": order_id,
-            "amount_refunded": amount_refunded,
-        }
-    )
+    if is_enabled_for(logging.INFO):
+        logger.info(
+            "Charge refunded charge=%s order=%s amount_refunded=%s",
+            charge_id, order_id, amount_refunded,
+        )
     
     # TODO: Update order status
     # TODO: Notify customer of refund
@@ -158,15 +274,26 @@ async def handle_checkout_completed(session: Dict[str, Any]) -> None:
     amount_total = session.get("amount_total")
     customer_email = session.get("customer_details", {}).get("email")
     
-    logger.info(
-        f"Checkout session completed",
-        extra={
-            "session_id": session_id,
-            "order_id": order_id,
-            "amount": amount_total,
-            "customer_email": customer_email,
-        }
-    )
+    if is_enabled_for(logging.INFO):
+        logger.info(
+            "Checkout session completed session=%s order=%s amount=%s customer_email=%s",
+            session_id, order_id, amount_total, customer_email,
+        )
     
     # TODO: Mark order as paid
     # TODO: Send receipt to customer
+
+
+async def handle_payment_link_created(payment_link: Dict[str, Any]) -> None:
+    """Handle payment link creation event."""
+    logger.info("Payment link created: %s", payment_link.get("id"))
+
+
+# Event type to handler, looked up once per event
+EVENT_HANDLERS: Dict[str, Callable[[Dict[str, Any]], Awaitable[None]]] = {
+    sys.intern("payment_intent.succeeded"): handle_payment_succeeded,
+    sys.intern("payment_intent.payment_failed"): handle_payment_failed,
+    sys.intern("charge.refunded"): handle_charge_refunded,
+    sys.intern("checkout.session.completed"): handle_checkout_completed,
+    sys.intern("payment_link.created"): handle_payment_link_created,
+}
@@ -1,100 +1,142 @@
 """
 Tests for the restaurant voice agent behavior.
+
+LLM traffic is replayed from the cassettes in tests/cassettes/test_agent/.
+Record missing ones with `pytest --record-mode=once` and re-record with
+`pytest --record-mode=rewrite` (both need API keys). Order IDs are numbered
+per test so request bodies, which cassettes match on, are the same every run.
+
+Single-turn cases share one started session per module and reset its chat
+history between cases. Multi-turn flows build their own agent and session.
+Tests can be spread across pytest-xdist workers (`pytest -n 8 --dist=load`);
+every test writes its own cassette, so workers never share a file.
 """
 
+import itertools
+import uuid
+from types import SimpleNamespace
+
 import pytest
+import pytest_asyncio
 from livekit.agents import AgentSession
+from livekit.agents.llm import ChatContext
 from livekit.plugins import openai
 
+from agents.models import order as order_module
 from agents.restaurant_agent import RestaurantAgent
 
 
-@pytest.fixture
-def llm():
-    """LLM instance for test validation."""
-    return openai.LLM(model="gpt-4-turbo-preview")
+AGENT_LLM = "openai/gpt-4-turbo-preview"
 
 
-@pytest.mark.asyncio
-async def test_agent_greeting(llm):
-    """Test that the agent greets the user appropriately."""
-    agent = RestaurantAgent()
-    session = AgentSession(
-        stt="text-only",
-        llm="openai/gpt-4-turbo-preview",
-        tts="text-only",
-    )
-    
-    await session.start(agent)
+# Every test in this module runs on one module-scoped event loop, so the
+# shared LLM client's pooled connections never cross event loops
+pytestmark = pytest.mark.asyncio(loop_scope="module")
+
+
+@pytest.fixture(autouse=True)
+def deterministic_order_ids(monkeypatch):
+    """Number order IDs from 1 in each test instead of drawing random UUIDs."""
+    counter = itertools.count(1)
     
-    # Test greeting
-    result = await session.run(user_input="Hello")
+    # Order IDs keep the leading 8 hex digits, so put the counter there
+    def uuid4() -> uuid.UUID:
+        return uuid.UUID(int=next(counter) << 96)
     
-    await result.expect.next_event().is_message(role="assistant").judge(
-        llm,
-        intent="Offers a friendly greeting and asks how they can help with ordering food"
-    )
+    monkeypatch.setattr(order_module, "uuid", SimpleNamespace(uuid4=uuid4))
 
 
-@pytest.mark.asyncio
-async def test_menu_search(llm):
-    """Test that the agent can search the menu."""
+@pytest.fixture(scope="module")
+def llm():
+    """LLM instance for test validation, shared across this module."""
+    return openai.LLM(model="gpt-4-turbo-preview")
+
+
+@pytest.fixture(scope="session")
+def agent_session_factory():
+    """Factory building text-only agent sessions with the shared configuration."""
+    session_kwargs = {
+        "stt": "text-only",
+        "llm": AGENT_LLM,
+        "tts": "text-only",
+    }
+    
+    def make_session() -> AgentSession:
+        return AgentSession(**session_kwargs)
+    
+    return make_session
+
+
+SINGLE_TURN_CASES = [
+    pytest.param(
+        "Hello",
+        None,
+        "Offers a friendly greeting and asks how they can help with ordering food",
+        id="greeting",
+    ),
+    pytest.param(
+        "What burgers do you have?",
+        "search_menu",
+        "Lists available burger options with descriptions and prices",
+        id="menu_search",
+    ),
+    pytest.param(
+        "I'd like a Classic Cheeseburger",
+        "add_item_to_order",
+        "Confirms the burger was added to the order and mentions the price",
+        id="add_item_to_order",
+    ),
+    pytest.param(
+        "Do you have any vegan options?",
+        "search_menu",
+        "Lists available vegan menu items",
+        id="dietary_restrictions",
+    ),
+]
+
+
+@pytest_asyncio.fixture(scope="module", loop_scope="module")
+async def started_session(agent_session_factory):
+    """One started session shared by the single-turn cases in this module."""
     agent = RestaurantAgent()
-    session = AgentSession(
-        stt="text-only",
-        llm="openai/gpt-4-turbo-preview",
-        tts="text-only",
-    )
+    session = agent_session_factory()
     
     await session.start(agent)
     
-    # Test menu search
-    result = await session.run(user_input="What burgers do you have?")
-    
-    # Should call search_menu function
-    result.expect.contains_function_call(name="search_menu")
+    yield session, agent
     
-    # Should respond with burger options
-    await result.expect.next_event().is_message(role="assistant").judge(
-        llm,
-        intent="Lists available burger options with descriptions and prices"
-    )
+    await session.aclose()
 
 
-@pytest.mark.asyncio
-async def test_add_item_to_order(llm):
-    """Test adding an item to the order."""
-    agent = RestaurantAgent()
-    session = AgentSession(
-        stt="text-only",
-        llm="openai/gpt-4-turbo-preview",
-        tts="text-only",
-    )
-    
-    await session.start(agent)
+@pytest_asyncio.fixture(loop_scope="module")
+async def _reset_agent_state(started_session):
+    """Give each single-turn case an empty conversation."""
+    _, agent = started_session
+    await agent.update_chat_ctx(ChatContext.empty())
+
+
+@pytest.mark.vcr
+@pytest.mark.parametrize("user_input,expected_call,intent", SINGLE_TURN_CASES)
+async def test_single_turn(llm, started_session, _reset_agent_state, user_input, expected_call, intent):
+    """Test single-turn requests against a shared agent session."""
+    session, _ = started_session
     
-    # Add item to order
-    result = await session.run(user_input="I'd like a Classic Cheeseburger")
+    result = await session.run(user_input=user_input)
     
-    # Should call add_item_to_order function
-    result.expect.contains_function_call(name="add_item_to_order")
+    if expected_call:
+        result.expect.contains_function_call(name=expected_call)
     
-    # Should confirm the addition
     await result.expect.next_event().is_message(role="assistant").judge(
         llm,
-        intent="Confirms the burger was added to the order and mentions the price"
+        intent=intent
     )
 
 
-@pytest.mark.asyncio
-async def test_order_summary(llm):
+@pytest.mark.vcr
+async def test_order_summary(llm, agent_session_factory):
     """Test getting an order summary."""
     agent = RestaurantAgent()
-    session = AgentSession(
-        stt="text-only",
-        llm="openai/gpt-4-turbo-preview",
-        tts="text-only",
-    )
+    session = agent_session_factory()
     
     await session.start(agent)
     
@@ -114,40 +156,11 @@ async def test_order_summary(llm):
     )
 
 
-@pytest.mark.asyncio
-async def test_dietary_restrictions(llm):
-    """Test searching for items with dietary restrictions."""
-    agent = RestaurantAgent()
-    session = AgentSession(
-        stt="text-only",
-        llm="openai/gpt-4-turbo-preview",
-        tts="text-only",
-    )
-    
-    await session.start(agent)
-    
-    # Search for vegan options
-    result = await session.run(user_input="Do you have any vegan options?")
-    
-    # Should search menu with dietary filter
-    result.expect.contains_function_call(name="search_menu")
-    
-    # Should list vegan items
-    await result.expect.next_event().is_message(role="assistant").judge(
-        llm,
-        intent="Lists available vegan menu items"
-    )
-
-
-@pytest.mark.asyncio
-async def test_order_modification(llm):
+@pytest.mark.vcr
+async def test_order_modification(llm, agent_session_factory):
     """Test modifying an order."""
     agent = RestaurantAgent()
-    session = AgentSession(
-        stt="text-only",
-        llm="openai/gpt-4-turbo-preview",
-        tts="text-only",
-    )
+    session = agent_session_factory()
     
     await session.start(agent)
     
@@ -167,15 +180,11 @@ async def test_order_modification(llm):
     )
 
 
-@pytest.mark.asyncio
-async def test_complete_order_flow(llm):
+@pytest.mark.vcr
+async def test_complete_order_flow(llm, agent_session_factory):
     """Test the complete order flow from start to payment."""
     agent = RestaurantAgent()
-    session = AgentSession(
-        stt="text-only",
-        llm="openai/gpt-4-turbo-preview",
-        tts="text-only",
-    )
+    session = agent_session_factory()
     
     await session.start(agent)
     
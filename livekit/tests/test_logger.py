@@ -0,0 +1,29 @@
+"""
+Tests for the structured logging setup.
+"""
+
+import json
+
+import pytest
+import structlog
+
+from monitoring.logger import get_logger, setup_logging
+
+
+@pytest.fixture
+def json_logging(tmp_path):
+    """Configure JSON logging for one test and restore the previous config."""
+    config = structlog.get_config()
+    setup_logging(log_level="INFO", log_file=str(tmp_path / "app.log"), enable_json=True)
+    yield
+    structlog.configure(**config)
+
+
+def test_json_log_with_int_keys(json_logging, capsys):
+    logger = get_logger("tests.logger")
+
+    logger.info("item counts", counts={1: 2, 3: 4})
+
+    event = json.loads(capsys.readouterr().out.strip().splitlines()[-1])
+    assert event["event"] == "item counts"
+    assert event["counts"] == {"1": 2, "3": 4}
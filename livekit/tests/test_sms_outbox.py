@@ -0,0 +1,86 @@
+"""
+Tests for the SMS outbox batching used by the Twilio client.
+
+A fake send coroutine stands in for Twilio, recording each batch of
+messages that is in flight at the same time.
+"""
+
+import asyncio
+
+import pytest
+
+from twilio.sms_client import SMSOutbox
+
+
+class FakeSender:
+    """Records sent messages and fails for recipients listed in fail_for."""
+
+    def __init__(self, delay: float = 0.01, fail_for: tuple = ()):
+        self.delay = delay
+        self.fail_for = fail_for
+        self.sent = []
+
+    async def __call__(self, to: str, message: str) -> str:
+        await asyncio.sleep(self.delay)
+        if to in self.fail_for:
+            raise RuntimeError(f"send to {to} failed")
+        self.sent.append((to, message))
+        return f"SM{len(self.sent)}"
+
+
+async def test_idle_message_is_sent_immediately():
+    send = FakeSender(delay=0)
+    outbox = SMSOutbox(send, max_wait=10)
+
+    sid = await asyncio.wait_for(outbox.put("+15550000001", "hello"), timeout=1)
+
+    assert sid == "SM1"
+    assert send.sent == [("+15550000001", "hello")]
+    await outbox.close()
+
+
+async def test_futures_resolve_to_their_own_results():
+    send = FakeSender()
+    outbox = SMSOutbox(send, batch_size=4, max_wait=0.01)
+
+    futures = [outbox.put(f"+1555000000{i}", f"message {i}") for i in range(10)]
+    sids = await asyncio.gather(*futures)
+
+    assert len(set(sids)) == 10
+    assert sorted(send.sent) == sorted((f"+1555000000{i}", f"message {i}") for i in range(10))
+    await outbox.close()
+
+
+async def test_send_error_propagates_to_its_message_only():
+    send = FakeSender(fail_for=("+15550000002",))
+    outbox = SMSOutbox(send)
+
+    ok = outbox.put("+15550000001", "first")
+    failed = outbox.put("+15550000002", "second")
+
+    assert await ok == "SM1"
+    with pytest.raises(RuntimeError, match="failed"):
+        await failed
+    await outbox.close()
+
+
+async def test_close_sends_queued_messages():
+    send = FakeSender(delay=0.05)
+    outbox = SMSOutbox(send, batch_size=2, max_wait=10)
+
+    futures = [outbox.put(f"+1555000000{i}", "queued") for i in range(5)]
+    await asyncio.sleep(0)
+    await outbox.close()
+
+    assert all(future.done() and not future.cancelled() for future in futures)
+    assert len(send.sent) == 5
+
+
+async def test_put_after_close_restarts_worker():
+    send = FakeSender(delay=0)
+    outbox = SMSOutbox(send)
+    await outbox.put("+15550000001", "before")
+    await outbox.close()
+
+    assert await outbox.put("+15550000001", "after") == "SM2"
+    await outbox.close()
@@ -0,0 +1,103 @@
+"""
+Tests for Stripe webhook signature verification.
+
+Headers are signed here with a test secret, the same way Stripe signs them:
+HMAC-SHA256 over "<timestamp>.<payload>", sent as "t=<timestamp>,v1=<hex>".
+"""
+
+import hashlib
+import hmac
+import time
+
+import pytest
+from stripe import SignatureVerificationError
+
+from stripe import webhook_handler
+from stripe.webhook_handler import SIGNATURE_TOLERANCE, verify_signature
+
+
+SECRET = "whsec_test_secret"
+PAYLOAD = b'{"id": "evt_test", "type": "payment_intent.succeeded"}'
+
+
+@pytest.fixture(autouse=True)
+def signing_secret(monkeypatch):
+    """Key the handler's HMAC with the test secret."""
+    monkeypatch.setattr(
+        webhook_handler,
+        "_signature_hmac",
+        hmac.new(SECRET.encode(), digestmod=hashlib.sha256),
+    )
+
+
+def sign(payload: bytes, timestamp: int, secret: str = SECRET) -> str:
+    """Compute a v1 signature for a payload and timestamp."""
+    signed_payload = f"{timestamp}.".encode() + payload
+    return hmac.new(secret.encode(), signed_payload, hashlib.sha256).hexdigest()
+
+
+def test_valid_signature():
+    timestamp = int(time.time())
+    header = f"t={timestamp},v1={sign(PAYLOAD, timestamp)}"
+
+    verify_signature(PAYLOAD, header)
+
+
+def test_wrong_signature():
+    timestamp = int(time.time())
+    header = f"t={timestamp},v1={sign(PAYLOAD, timestamp, secret='whsec_other')}"
+
+    with pytest.raises(SignatureVerificationError):
+        verify_signature(PAYLOAD, header)
+
+
+def test_tampered_payload():
+    timestamp = int(time.time())
+    header = f"t={timestamp},v1={sign(PAYLOAD, timestamp)}"
+
+    with pytest.raises(SignatureVerificationError):
+        verify_signature(PAYLOAD + b" ", header)
+
+
+def test_multiple_v1_signatures():
+    """During secret rotation Stripe sends one v1 entry per active secret."""
+    timestamp = int(time.time())
+    header = (
+        f"t={timestamp},"
+        f"v1={sign(PAYLOAD, timestamp, secret='whsec_old')},"
+        f"v1={sign(PAYLOAD, timestamp)},"
+        f"v0={sign(PAYLOAD, timestamp)}"
+    )
+
+    verify_signature(PAYLOAD, header)
+
+
+def test_only_other_schemes():
+    timestamp = int(time.time())
+    header = f"t={timestamp},v0={sign(PAYLOAD, timestamp)}"
+
+    with pytest.raises(SignatureVerificationError):
+        verify_signature(PAYLOAD, header)
+
+
+def test_missing_timestamp():
+    timestamp = int(time.time())
+    header = f"v1={sign(PAYLOAD, timestamp)}"
+
+    with pytest.raises(SignatureVerificationError):
+        verify_signature(PAYLOAD, header)
+
+
+def test_non_numeric_timestamp():
+    header = f"t=abc,v1={sign(PAYLOAD, 0)}"
+
+    with pytest.raises(SignatureVerificationError):
+        verify_signature(PAYLOAD, header)
+
+
+def test_expired_timestamp():
+    timestamp = int(time.time()) - SIGNATURE_TOLERANCE - 60
+    header = f"t={timestamp},v1={sign(PAYLOAD, timestamp)}"
+
+    with pytest.raises(SignatureVerificationError):
+        verify_signature(PAYLOAD, header)
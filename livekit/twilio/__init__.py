@@ -2,6 +2,6 @@
 Twilio SMS integration module for sending order notifications.
 """
 
-from twilio.sms_client import TwilioSMSClient
+from twilio.sms_client import TwilioSMSClient, get_default_sms_client, validate_twilio_env
 
-__all__ = ["TwilioSMSClient"]
+__all__ = ["TwilioSMSClient", "get_default_sms_client", "validate_twilio_env"]
@@ -0,0 +1,66 @@
+"""
+Data models for Twilio webhook payloads.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Optional
+from urllib.parse import parse_qsl
+
+# Upper bound on form fields parsed from a webhook body
+MAX_FORM_FIELDS = 64
+
+
+def parse_form(body: bytes) -> Dict[str, str]:
+    """
+    Decode a URL-encoded Twilio webhook body.
+    
+    Args:
+        body: Raw request body
+        
+    Returns:
+        Field names mapped to values
+        
+    Raises:
+        ValueError: If the body has more than MAX_FORM_FIELDS fields
+    """
+    return dict(parse_qsl(body.decode(), max_num_fields=MAX_FORM_FIELDS))
+
+
+@dataclass(slots=True)
+class TwilioStatus:
+    """SMS delivery status callback."""
+    
+    message_sid: Optional[str]
+    message_status: Optional[str]
+    to: Optional[str]
+    error_code: Optional[str]
+    error_message: Optional[str]
+    
+    @classmethod
+    def from_form(cls, fields: Dict[str, str]) -> "TwilioStatus":
+        """Build from decoded webhook form fields."""
+        return cls(
+            message_sid=fields.get("MessageSid"),
+            message_status=fields.get("MessageStatus"),
+            to=fields.get("To"),
+            error_code=fields.get("ErrorCode"),
+            error_message=fields.get("ErrorMessage"),
+        )
+
+
+@dataclass(slots=True)
+class TwilioIncomingMessage:
+    """Incoming SMS from a customer."""
+    
+    message_sid: Optional[str]
+    from_number: Optional[str]
+    body: str
+    
+    @classmethod
+    def from_form(cls, fields: Dict[str, str]) -> "TwilioIncomingMessage":
+        """Build from decoded webhook form fields."""
+        return cls(
+            message_sid=fields.get("MessageSid"),
+            from_number=fields.get("From"),
+            body=fields.get("Body", ""),
+        )
@@ -3,7 +3,12 @@ Twilio SMS client for sending order notifications and payment links.
 """
 
 import os
-from typing import Optional
+import asyncio
+import logging
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Dict, Final, List, Optional, Set
+
+import httpx
 from twilio.rest import Client
 from twilio.base.exceptions import TwilioRestException
 
@@ -12,14 +17,188 @@ from twilio.templates import (
     format_payment_link_message,
     format_order_status_update,
 )
-from monitoring.logger import get_logger
+from monitoring.logger import get_logger, is_enabled_for
 
 logger = get_logger(__name__)
 
+# HTTP/2 needs the optional h2 package (httpx[http2])
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# Twilio credentials, read once at import
+TWILIO_ACCOUNT_SID: Final[Optional[str]] = os.environ.get("TWILIO_ACCOUNT_SID")
+TWILIO_AUTH_TOKEN: Final[Optional[str]] = os.environ.get("TWILIO_AUTH_TOKEN")
+TWILIO_PHONE_NUMBER: Final[Optional[str]] = os.environ.get("TWILIO_PHONE_NUMBER")
+
+TWILIO_API_BASE_URL = "https://api.twilio.com/2010-04-01"
+TWILIO_TIMEOUT = 10.0
+TWILIO_CONNECT_TIMEOUT = 3.0
+TWILIO_MAX_CONNECTIONS = 64
+
+# Cap on in-flight requests to stay under Twilio's per-account rate limit
+TWILIO_MAX_CONCURRENT_REQUESTS = 32
+
+# Outbox batching for notification messages
+SMS_OUTBOX_BATCH_SIZE = 32
+SMS_OUTBOX_MAX_WAIT = 0.05
+
+
+def validate_twilio_env() -> None:
+    """
+    Check that the Twilio credentials are configured.
+    
+    Call once at application startup to fail fast on misconfiguration.
+    
+    Raises:
+        ValueError: If any Twilio credential environment variable is unset
+    """
+    missing = [
+        name
+        for name, value in (
+            ("TWILIO_ACCOUNT_SID", TWILIO_ACCOUNT_SID),
+            ("TWILIO_AUTH_TOKEN", TWILIO_AUTH_TOKEN),
+            ("TWILIO_PHONE_NUMBER", TWILIO_PHONE_NUMBER),
+        )
+        if not value
+    ]
+    if missing:
+        raise ValueError(f"Twilio credentials not configured. Set {', '.join(missing)}.")
+
+
+def _rest_exception(response: httpx.Response) -> TwilioRestException:
+    """Build a TwilioRestException from a failed REST API response."""
+    try:
+        body = response.json()
+    except ValueError:
+        body = {}
+    return TwilioRestException(
+        status=response.status_code,
+        uri=str(response.request.url),
+        msg=body.get("message", response.text),
+        code=body.get("code"),
+        method=response.request.method,
+    )
+
+
+class SMSOutbox:
+    """
+    Buffers outgoing SMS messages and sends them in concurrent batches.
+    
+    A message sent while no batch is in flight goes out immediately; only
+    under load does the outbox wait up to max_wait for a batch to fill.
+    """
+    
+    def __init__(
+        self,
+        send: Callable[..., Awaitable[str]],
+        batch_size: int = SMS_OUTBOX_BATCH_SIZE,
+        max_wait: float = SMS_OUTBOX_MAX_WAIT,
+    ):
+        """
+        Initialize the outbox.
+        
+        Args:
+            send: Coroutine function sending one message, called as send(to=..., message=...)
+            batch_size: Maximum number of messages sent per batch
+            max_wait: Seconds to wait for a batch to fill while earlier batches are in flight
+        """
+        self._send = send
+        self.batch_size = batch_size
+        self.max_wait = max_wait
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker_task: Optional[asyncio.Task] = None
+        self._batch_tasks: Set[asyncio.Task] = set()
+    
+    def put(self, to: str, message: str) -> asyncio.Future:
+        """
+        Queue a message for sending.
+        
+        Args:
+            to: Recipient phone number
+            message: Message content
+            
+        Returns:
+            Future resolving to the message SID, or raising the send error.
+            Fire-and-forget callers may ignore it.
+        """
+        loop = asyncio.get_running_loop()
+        if self._worker_task is None or self._worker_task.done():
+            self._queue = asyncio.Queue()
+            self._worker_task = loop.create_task(self._worker(self._queue))
+        
+        future = loop.create_future()
+        self._queue.put_nowait((to, message, future))
+        return future
+    
+    async def _worker(self, queue: asyncio.Queue) -> None:
+        """Collect queued messages into batches and dispatch each batch."""
+        while True:
+            batch = [await queue.get()]
+            
+            # Under load, give the batch a chance to fill up unless it is already full
+            if self._batch_tasks and queue.qsize() < self.batch_size - 1:
+                try:
+                    await asyncio.sleep(self.max_wait)
+                except asyncio.CancelledError:
+                    # Closing: send what was collected rather than dropping it
+                    self._dispatch(batch)
+                    raise
+            
+            while len(batch) < self.batch_size and not queue.empty():
+                batch.append(queue.get_nowait())
+            
+            self._dispatch(batch)
+    
+    def _dispatch(self, batch: List[tuple]) -> None:
+        """Send a batch in the background so the next batch can start filling."""
+        task = asyncio.create_task(self._send_batch(batch))
+        self._batch_tasks.add(task)
+        task.add_done_callback(self._batch_tasks.discard)
+    
+    async def _send_batch(self, batch: List[tuple]) -> None:
+        """Send a batch concurrently and resolve each message's future."""
+        results = await asyncio.gather(
+            *(self._send(to=to, message=message) for to, message, _ in batch),
+            return_exceptions=True,
+        )
+        
+        for (_, _, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+    
+    async def close(self) -> None:
+        """Stop batching, send any queued messages and wait for all batches to finish."""
+        if self._worker_task is not None:
+            self._worker_task.cancel()
+            try:
+                await self._worker_task
+            except asyncio.CancelledError:
+                pass
+            self._worker_task = None
+        
+        pending = []
+        while self._queue is not None and not self._queue.empty():
+            pending.append(self._queue.get_nowait())
+        for start in range(0, len(pending), self.batch_size):
+            self._dispatch(pending[start:start + self.batch_size])
+        
+        if self._batch_tasks:
+            await asyncio.gather(*self._batch_tasks, return_exceptions=True)
+
 
 class TwilioSMSClient:
     """Client for sending SMS messages via Twilio."""
     
+    # Set once the first client has logged its initialization
+    _initialized = False
+    
     def __init__(
         self,
         account_sid: Optional[str] = None,
@@ -34,9 +213,9 @@ class TwilioSMSClient:
             auth_token: Twilio Auth Token (defaults to TWILIO_AUTH_TOKEN env var)
             from_number: Twilio phone number to send from (defaults to TWILIO_PHONE_NUMBER env var)
         """
-        self.account_sid = account_sid or os.getenv("TWILIO_ACCOUNT_SID")
-        self.auth_token = auth_token or os.getenv("TWILIO_AUTH_TOKEN")
-        self.from_number = from_number or os.getenv("TWILIO_PHONE_NUMBER")
+        self.account_sid = account_sid or TWILIO_ACCOUNT_SID
+        self.auth_token = auth_token or TWILIO_AUTH_TOKEN
+        self.from_number = from_number or TWILIO_PHONE_NUMBER
         
         if not all([self.account_sid, self.auth_token, self.from_number]):
             raise ValueError(
@@ -45,7 +224,28 @@ class TwilioSMSClient:
             )
         
         self.client = Client(self.account_sid, self.auth_token)
-        logger.info("Twilio SMS client initialized")
+        self._http = httpx.AsyncClient(
+            auth=(self.account_sid, self.auth_token),
+            base_url=TWILIO_API_BASE_URL,
+            http2=HTTP2_AVAILABLE,
+            timeout=httpx.Timeout(TWILIO_TIMEOUT, connect=TWILIO_CONNECT_TIMEOUT),
+            limits=httpx.Limits(
+                max_connections=TWILIO_MAX_CONNECTIONS,
+                max_keepalive_connections=TWILIO_MAX_CONNECTIONS,
+            ),
+        )
+        self._request_semaphore = asyncio.Semaphore(TWILIO_MAX_CONCURRENT_REQUESTS)
+        self.outbox = SMSOutbox(self.send_sms)
+        self._messages_path = f"/Accounts/{self.account_sid}/Messages.json"
+        self._message_path = f"/Accounts/{self.account_sid}/Messages/{{}}.json"
+        if not TwilioSMSClient._initialized:
+            TwilioSMSClient._initialized = True
+            logger.info("Twilio SMS client initialized")
+    
+    async def close(self) -> None:
+        """Flush the outbox and close the pooled HTTP connections."""
+        await self.outbox.close()
+        await self._http.aclose()
     
     async def send_sms(
         self,
@@ -69,39 +269,90 @@ class TwilioSMSClient:
         """
         try:
             params = {
-                "from_": self.from_number,
-                "to": to,
-                "body": message,
+                "From": self.from_number,
+                "To": to,
+                "Body": message,
             }
             
             if status_callback:
-                params["status_callback"] = status_callback
+                params["StatusCallback"] = status_callback
+            
+            async with self._request_semaphore:
+                response = await self._http.post(self._messages_path, data=params)
+            if response.is_error:
+                raise _rest_exception(response)
             
-            sms = self.client.messages.create(**params)
+            sms = response.json()
             
             logger.info(
-                f"SMS sent successfully",
+                "SMS sent successfully",
                 extra={
                     "to": to,
-                    "message_sid": sms.sid,
-                    "status": sms.status,
+                    "message_sid": sms["sid"],
+                    "status": sms["status"],
                 }
             )
             
-            return sms.sid
+            return sms["sid"]
         
         except TwilioRestException as e:
             logger.error(
-                f"Failed to send SMS",
+                "Failed to send SMS",
                 extra={
                     "to": to,
                     "error_code": e.code,
                     "error_message": e.msg,
                 },
-                exc_info=True
+                exc_info=is_enabled_for(logging.DEBUG),
             )
             raise
     
+    async def send_many(self, messages: List[Dict[str, Any]]) -> List[str]:
+        """
+        Send several SMS messages concurrently.
+        
+        Args:
+            messages: Keyword arguments for send_sms, one dict per message
+            
+        Returns:
+            Message SIDs, in the same order as messages
+            
+        Raises:
+            TwilioRestException: If any message fails to send
+        """
+        return await asyncio.gather(*(self.send_sms(**m) for m in messages))
+    
+    async def send_order_confirmations(self, batch: List[Dict[str, Any]]) -> List[str]:
+        """
+        Send order confirmation SMS messages for several orders concurrently.
+        
+        Args:
+            batch: One dict per order with `to` plus the send_order_confirmation
+                arguments (order_id, total, payment_link, order_type)
+            
+        Returns:
+            Message SIDs, in the same order as batch
+        """
+        messages = [
+            {
+                "to": item["to"],
+                "message": format_order_confirmation(
+                    order_id=item["order_id"],
+                    total=item["total"],
+                    payment_link=item.get("payment_link"),
+                    order_type=item.get("order_type", "pickup"),
+                ),
+            }
+            for item in batch
+        ]
+        
+        logger.info(
+            "Sending order confirmations",
+            extra={"count": len(messages)}
+        )
+        
+        return await self.send_many(messages)
+    
     async def send_order_confirmation(
         self,
         to: str,
@@ -131,11 +382,11 @@ class TwilioSMSClient:
         )
         
         logger.info(
-            f"Sending order confirmation",
+            "Sending order confirmation",
             extra={"order_id": order_id, "to": to}
         )
         
-        return await self.send_sms(to=to, message=message)
+        return await self.outbox.put(to, message)
     
     async def send_payment_link(
         self,
@@ -163,11 +414,11 @@ class TwilioSMSClient:
         )
         
         logger.info(
-            f"Sending payment link",
+            "Sending payment link",
             extra={"order_id": order_id, "to": to}
         )
         
-        return await self.send_sms(to=to, message=message)
+        return await self.outbox.put(to, message)
     
     async def send_order_status_update(
         self,
@@ -195,16 +446,69 @@ class TwilioSMSClient:
         )
         
         logger.info(
-            f"Sending order status update",
+            "Sending order status update",
             extra={"order_id": order_id, "status": status, "to": to}
         )
         
-        return await self.send_sms(to=to, message=message)
+        return await self.outbox.put(to, message)
+    
+    async def fetch_message_status(self, message_sid: str) -> dict:
+        """
+        Get the status of a sent message without blocking the event loop.
+        
+        Args:
+            message_sid: Message SID from Twilio
+            
+        Returns:
+            Dictionary with message status details (date_sent is the raw
+            RFC 2822 string from the API)
+            
+        Raises:
+            TwilioRestException: If the lookup fails
+        """
+        try:
+            async with self._request_semaphore:
+                response = await self._http.get(self._message_path.format(message_sid))
+            if response.is_error:
+                raise _rest_exception(response)
+            
+            message = response.json()
+            
+            return {
+                "sid": message["sid"],
+                "status": message["status"],
+                "to": message["to"],
+                "from": message["from"],
+                "date_sent": message["date_sent"],
+                "error_code": message["error_code"],
+                "error_message": message["error_message"],
+            }
+        
+        except TwilioRestException as e:
+            logger.error(
+                "Failed to fetch message status: %s", e,
+                exc_info=is_enabled_for(logging.DEBUG),
+            )
+            raise
+    
+    async def get_message_statuses(self, message_sids: List[str]) -> List[dict]:
+        """
+        Get the status of several sent messages concurrently.
+        
+        Args:
+            message_sids: Message SIDs from Twilio
+            
+        Returns:
+            Status dictionaries, in the same order as message_sids
+        """
+        return await asyncio.gather(*(self.fetch_message_status(sid) for sid in message_sids))
     
     def get_message_status(self, message_sid: str) -> dict:
         """
         Get the status of a sent message.
         
+        Blocking; prefer fetch_message_status from async code.
+        
         Args:
             message_sid: Message SID from Twilio
             
@@ -225,5 +529,49 @@ class TwilioSMSClient:
             }
         
         except TwilioRestException as e:
-            logger.error(f"Failed to fetch message status: {e}", exc_info=True)
+            logger.error(
+                "Failed to fetch message status: %s", e,
+                exc_info=is_enabled_for(logging.DEBUG),
+            )
             raise
+
+
+# Shared clients created by _make_client, closed by close_sms_clients
+_clients: List[TwilioSMSClient] = []
+
+
+@lru_cache(maxsize=8)
+def _make_client(
+    account_sid: Optional[str],
+    auth_token: Optional[str],
+    from_number: Optional[str],
+) -> TwilioSMSClient:
+    """Create one client per distinct set of credentials."""
+    client = TwilioSMSClient(account_sid, auth_token, from_number)
+    _clients.append(client)
+    return client
+
+
+def get_default_sms_client() -> TwilioSMSClient:
+    """
+    Get the shared SMS client for the configured Twilio credentials.
+    
+    Returns:
+        TwilioSMSClient built from the TWILIO_* environment variables
+        
+    Raises:
+        ValueError: If the Twilio credentials are not configured
+    """
+    return _make_client(TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN, TWILIO_PHONE_NUMBER)
+
+
+async def close_sms_clients() -> None:
+    """
+    Close the shared SMS clients, sending any messages still in their outboxes.
+    
+    Does nothing if no shared client was ever created.
+    """
+    clients = list(_clients)
+    _clients.clear()
+    _make_client.cache_clear()
+    await asyncio.gather(*(client.close() for client in clients))
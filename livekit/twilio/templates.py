@@ -3,12 +3,36 @@ SMS message templates for Twilio notifications.
 """
 
 import os
+from functools import lru_cache
+from types import MappingProxyType
 from typing import Optional
 
 RESTAURANT_NAME = os.getenv("RESTAURANT_NAME", "Our Restaurant")
 RESTAURANT_PHONE = os.getenv("RESTAURANT_PHONE", "")
 
+# Formatted messages kept per formatter; resends of the same order reuse them
+TEMPLATE_CACHE_SIZE = 4096
 
+# Fixed message fragments, built once at import
+CONFIRMED_HEADER = f"✅ {RESTAURANT_NAME}\n\n"
+PAYMENT_HEADER = f"💳 {RESTAURANT_NAME}\n\n"
+CALL_FOOTER = f"\nQuestions? Call {RESTAURANT_PHONE}" if RESTAURANT_PHONE else ""
+
+# Order status lookups, keyed by lowercase status
+_STATUS_EMOJI = MappingProxyType({
+    "confirmed": "✅",
+    "preparing": "👨‍🍳",
+    "ready": "🎉",
+    "completed": "✨",
+    "cancelled": "❌",
+})
+_STATUS_SUFFIX = MappingProxyType({
+    "ready": "\n\nYour order is ready for pickup!",
+    "preparing": "\n\nYour order is being prepared.",
+})
+
+
+@lru_cache(maxsize=TEMPLATE_CACHE_SIZE)
 def format_order_confirmation(
     order_id: str,
     total: float,
@@ -27,22 +51,19 @@ def format_order_confirmation(
     Returns:
         Formatted SMS message
     """
-    message = f"✅ {RESTAURANT_NAME}\n\n"
-    message += f"Order #{order_id} confirmed!\n"
-    message += f"Total: ${total:.2f}\n"
-    message += f"Type: {order_type.title()}\n\n"
-    
-    if payment_link:
-        message += f"💳 Pay securely:\n{payment_link}\n\n"
-    
-    message += f"⏱️ Ready in 20-30 mins\n"
-    
-    if RESTAURANT_PHONE:
-        message += f"\nQuestions? Call {RESTAURANT_PHONE}"
-    
-    return message
+    payment_section = f"💳 Pay securely:\n{payment_link}\n\n" if payment_link else ""
+    return (
+        f"{CONFIRMED_HEADER}"
+        f"Order #{order_id} confirmed!\n"
+        f"Total: ${total:.2f}\n"
+        f"Type: {order_type.title()}\n\n"
+        f"{payment_section}"
+        f"⏱️ Ready in 20-30 mins\n"
+        f"{CALL_FOOTER}"
+    )
 
 
+@lru_cache(maxsize=TEMPLATE_CACHE_SIZE)
 def format_payment_link_message(
     order_id: str,
     payment_link: str,
@@ -59,15 +80,16 @@ def format_payment_link_message(
     Returns:
         Formatted SMS message
     """
-    message = f"💳 {RESTAURANT_NAME}\n\n"
-    message += f"Payment for Order #{order_id}\n"
-    message += f"Amount: ${amount:.2f}\n\n"
-    message += f"Click to pay securely:\n{payment_link}\n\n"
-    message += "Your order will be prepared after payment."
-    
-    return message
+    return (
+        f"{PAYMENT_HEADER}"
+        f"Payment for Order #{order_id}\n"
+        f"Amount: ${amount:.2f}\n\n"
+        f"Click to pay securely:\n{payment_link}\n\n"
+        "Your order will be prepared after payment."
+    )
 
 
+@lru_cache(maxsize=TEMPLATE_CACHE_SIZE)
 def format_order_status_update(
     order_id: str,
     status: str,
@@ -84,29 +106,15 @@ def format_order_status_update(
     Returns:
         Formatted SMS message
     """
-    status_emoji = {
-        "confirmed": "✅",
-        "preparing": "👨‍🍳",
-        "ready": "🎉",
-        "completed": "✨",
-        "cancelled": "❌",
-    }
+    status_key = status.lower()
+    eta_line = f"\n⏱️ Ready in {estimated_time} minutes" if estimated_time else ""
     
-    emoji = status_emoji.get(status.lower(), "ℹ️")
-    
-    message = f"{emoji} {RESTAURANT_NAME}\n\n"
-    message += f"Order #{order_id}\n"
-    message += f"Status: {status.title()}\n"
-    
-    if estimated_time:
-        message += f"\n⏱️ Ready in {estimated_time} minutes"
-    
-    if status.lower() == "ready":
-        message += "\n\nYour order is ready for pickup!"
-    elif status.lower() == "preparing":
-        message += "\n\nYour order is being prepared."
-    
-    return message
+    return (
+        f"{_STATUS_EMOJI.get(status_key, 'ℹ️')} {RESTAURANT_NAME}\n\n"
+        f"Order #{order_id}\n"
+        f"Status: {status.title()}\n"
+        f"{eta_line}{_STATUS_SUFFIX.get(status_key, '')}"
+    )
 
 
 def format_payment_receipt(
@@ -125,11 +133,23 @@ def format_payment_receipt(
     Returns:
         Formatted SMS message
     """
-    message = f"✅ {RESTAURANT_NAME}\n\n"
-    message += f"Payment Received\n"
-    message += f"Order #{order_id}\n"
-    message += f"Amount: ${total:.2f}\n"
-    message += f"Method: {payment_method.title()}\n\n"
-    message += "Thank you! Your order is being prepared."
+    return (
+        f"{CONFIRMED_HEADER}"
+        "Payment Received\n"
+        f"Order #{order_id}\n"
+        f"Amount: ${total:.2f}\n"
+        f"Method: {payment_method.title()}\n\n"
+        "Thank you! Your order is being prepared."
+    )
+
+
+def cache_clear() -> None:
+    """
+    Clear the cached messages of all formatters.
     
-    return message
+    RESTAURANT_NAME and RESTAURANT_PHONE are read once at import, so this is
+    only needed when they are changed at runtime, or between tests.
+    """
+    format_order_confirmation.cache_clear()
+    format_payment_link_message.cache_clear()
+    format_order_status_update.cache_clear()
@@ -2,17 +2,72 @@
 Webhook handler for Twilio delivery status callbacks.
 """
 
-from typing import Dict, Any
-from fastapi import APIRouter, Request, HTTPException
-from monitoring.logger import get_logger
+import logging
+from typing import Awaitable, Callable, Dict
+from xml.sax.saxutils import escape
+from fastapi import APIRouter, Request, HTTPException, Response
+from twilio.models import TwilioStatus, TwilioIncomingMessage, parse_form
+from twilio.templates import RESTAURANT_PHONE
+from monitoring.logger import get_logger, is_enabled_for
 
 logger = get_logger(__name__)
 
 router = APIRouter(prefix="/webhooks/twilio", tags=["twilio"])
 
+# TwiML envelope for SMS replies
+_TWIML_PREFIX = b'<?xml version="1.0" encoding="UTF-8"?><Response><Message>'
+_TWIML_SUFFIX = b'</Message></Response>'
 
-@router.post("/status")
-async def handle_sms_status(request: Request) -> Dict[str, str]:
+DEFAULT_SMS_REPLY = (
+    f"Thank you for your message! For immediate assistance, "
+    f"please call {RESTAURANT_PHONE or 'us'}."
+)
+
+
+def _twiml_message(text: str) -> bytes:
+    """Wrap a reply in a TwiML <Message> response body."""
+    return _TWIML_PREFIX + escape(text).encode() + _TWIML_SUFFIX
+
+
+_DEFAULT_SMS_REPLY_TWIML = _twiml_message(DEFAULT_SMS_REPLY)
+
+_CALL_US = f"call {RESTAURANT_PHONE}" if RESTAURANT_PHONE else "give us a call"
+
+HELP_SMS_REPLY = (
+    "Text STATUS <order id> to check on an order, "
+    "CANCEL <order id> to cancel one, or HELP to see this message."
+)
+
+
+async def _cmd_status(arg: str) -> str:
+    """Reply to STATUS <order_id>."""
+    if not arg:
+        return "Please include your order number, e.g. STATUS ORD-1234ABCD."
+    return f"For the latest on order #{arg.upper()}, please {_CALL_US}."
+
+
+async def _cmd_help(arg: str) -> str:
+    """Reply to HELP."""
+    return HELP_SMS_REPLY
+
+
+async def _cmd_cancel(arg: str) -> str:
+    """Reply to CANCEL <order_id>."""
+    if not arg:
+        return "Please include your order number, e.g. CANCEL ORD-1234ABCD."
+    return f"To cancel order #{arg.upper()}, please {_CALL_US} so we can stop preparation."
+
+
+# SMS commands keyed by their lowercase first word
+_COMMAND_DISPATCH: Dict[str, Callable[[str], Awaitable[str]]] = {
+    "status": _cmd_status,
+    "help": _cmd_help,
+    "cancel": _cmd_cancel,
+}
+
+
+@router.post("/status", status_code=204, response_class=Response)
+async def handle_sms_status(request: Request) -> Response:
     """
     Handle Twilio SMS delivery status webhook.
     
@@ -25,16 +80,16 @@ async def handle_sms_status(request: Request) -> Dict[str, str]:
     - undelivered: Message could not be delivered
     """
     try:
-        form_data = await request.form()
+        status = TwilioStatus.from_form(parse_form(await request.body()))
         
-        message_sid = form_data.get("MessageSid")
-        message_status = form_data.get("MessageStatus")
-        to_number = form_data.get("To")
-        error_code = form_data.get("ErrorCode")
-        error_message = form_data.get("ErrorMessage")
+        message_sid = status.message_sid
+        message_status = status.message_status
+        to_number = status.to
+        error_code = status.error_code
+        error_message = status.error_message
         
         logger.info(
-            f"SMS status update received",
+            "SMS status update received",
             extra={
                 "message_sid": message_sid,
                 "status": message_status,
@@ -45,11 +100,11 @@ async def handle_sms_status(request: Request) -> Dict[str, str]:
         
         # Handle specific statuses
         if message_status == "delivered":
-            logger.info(f"SMS delivered successfully: {message_sid}")
+            logger.info("SMS delivered successfully: %s", message_sid)
         
         elif message_status in ["failed", "undelivered"]:
             logger.error(
-                f"SMS delivery failed: {message_sid}",
+                "SMS delivery failed: %s", message_sid,
                 extra={
                     "error_code": error_code,
                     "error_message": error_message,
@@ -57,29 +112,32 @@ async def handle_sms_status(request: Request) -> Dict[str, str]:
             )
             # TODO: Implement retry logic or alternative notification method
         
-        return {"status": "received"}
+        return Response(status_code=204)
     
     except Exception as e:
-        logger.error(f"Error processing Twilio webhook: {e}", exc_info=True)
+        logger.error(
+            "Error processing Twilio webhook: %s", e,
+            exc_info=is_enabled_for(logging.DEBUG),
+        )
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
-@router.post("/incoming")
-async def handle_incoming_sms(request: Request) -> Dict[str, str]:
+@router.post("/incoming", response_class=Response)
+async def handle_incoming_sms(request: Request) -> Response:
     """
     Handle incoming SMS messages from customers.
     
     This can be used for customers to check order status, modify orders, etc.
     """
     try:
-        form_data = await request.form()
+        incoming = TwilioIncomingMessage.from_form(parse_form(await request.body()))
         
-        from_number = form_data.get("From")
-        message_body = form_data.get("Body", "").strip().lower()
-        message_sid = form_data.get("MessageSid")
+        from_number = incoming.from_number
+        message_body = incoming.body.strip().lower()
+        message_sid = incoming.message_sid
         
         logger.info(
-            f"Incoming SMS received",
+            "Incoming SMS received",
             extra={
                 "from": from_number,
                 "message_sid": message_sid,
@@ -87,24 +145,18 @@ async def handle_incoming_sms(request: Request) -> Dict[str, str]:
             }
         )
         
-        # TODO: Implement SMS command processing
-        # Examples:
-        # - "STATUS <order_id>" - Check order status
-        # - "HELP" - Get help information
-        # - "CANCEL <order_id>" - Cancel order
+        # Route on the first word; the argument keeps its original case
+        verb, _, arg = incoming.body.strip().partition(" ")
+        handler = _COMMAND_DISPATCH.get(verb.lower())
+        if handler is None:
+            return Response(content=_DEFAULT_SMS_REPLY_TWIML, media_type="application/xml")
         
-        # For now, just log and acknowledge
-        response_message = (
-            f"Thank you for your message! For immediate assistance, "
-            f"please call {logger.get('RESTAURANT_PHONE', 'us')}."
-        )
-        
-        # Return TwiML response
-        return {
-            "status": "received",
-            "response": response_message
-        }
+        response_message = await handler(arg.strip())
+        return Response(content=_twiml_message(response_message), media_type="application/xml")
     
     except Exception as e:
-        logger.error(f"Error processing incoming SMS: {e}", exc_info=True)
+        logger.error(
+            "Error processing incoming SMS: %s", e,
+            exc_info=is_enabled_for(logging.DEBUG),
+        )
         raise HTTPException(status_code=500, detail="Internal server error")